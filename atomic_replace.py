@@ -0,0 +1,166 @@
+"""
+Atomic replacement of installed skill directories and links.
+
+replace_path() swaps a fully written new tree (or symlink) into place with
+renameat2(RENAME_EXCHANGE) on Linux or renamex_np(RENAME_SWAP) on macOS, so
+readers see either the old skill or the new one and never a missing path.
+Elsewhere it falls back to two renames, which leaves only a rename-sized gap
+instead of the time it takes to delete the old tree. Displaced trees are
+deleted on a background thread; call wait_for_cleanup() before exiting.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import itertools
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+# renameat2() flag from <linux/fs.h> and renamex_np() flag from <stdio.h>
+RENAME_EXCHANGE = 1 << 1
+RENAME_SWAP = 0x00000002
+AT_FDCWD = -100
+
+# Errors meaning the kernel or filesystem cannot exchange, not that the paths are bad
+UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+# Leftover temporary trees older than this are assumed abandoned
+STALE_TEMP_SECONDS = 3600
+
+_counter = itertools.count()
+_cleanup_lock = threading.Lock()
+_cleanup_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _load_exchange():
+    """Return a function exchanging two paths atomically, or None if unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    except (OSError, TypeError):
+        return None
+
+    if sys.platform.startswith('linux') and hasattr(libc, 'renameat2'):
+        renameat2 = libc.renameat2
+        renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+        return lambda a, b: renameat2(AT_FDCWD, a, AT_FDCWD, b, RENAME_EXCHANGE)
+    if sys.platform == 'darwin' and hasattr(libc, 'renamex_np'):
+        renamex_np = libc.renamex_np
+        renamex_np.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint]
+        return lambda a, b: renamex_np(a, b, RENAME_SWAP)
+    return None
+
+
+_exchange = _load_exchange()
+
+
+def exchange_paths(a: Path, b: Path) -> bool:
+    """Atomically swap two existing paths.
+
+    Returns False when the platform or filesystem does not support it; other
+    failures raise OSError.
+    """
+    if _exchange is None:
+        return False
+    if _exchange(os.fsencode(a), os.fsencode(b)) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in UNSUPPORTED_ERRNOS:
+        return False
+    raise OSError(err, os.strerror(err), str(a))
+
+
+def displaced_path(path: Path) -> Path:
+    """A unique hidden name beside path for a tree that is about to be deleted."""
+    return path.with_name(f".{path.name}.old-{os.getpid()}-{next(_counter)}")
+
+
+def replace_path(new_path: Path, target_path: Path) -> Optional[Path]:
+    """Move new_path to target_path, replacing whatever is there.
+
+    Returns the path the previous target was moved to, which the caller
+    should pass to discard_tree(), or None if nothing was displaced.
+    """
+    if not (target_path.exists() or target_path.is_symlink()):
+        new_path.rename(target_path)
+        return None
+
+    target_is_dir = target_path.is_dir() and not target_path.is_symlink()
+    if not target_is_dir and not (new_path.is_dir() and not new_path.is_symlink()):
+        # rename() already replaces a file or symlink atomically
+        os.replace(new_path, target_path)
+        return None
+
+    if exchange_paths(new_path, target_path):
+        # new_path now holds the old tree; move it out of the way of the next import
+        old_path = displaced_path(target_path)
+        new_path.rename(old_path)
+        return old_path
+
+    # Rename-swap fallback: the target is missing only between the two renames
+    old_path = displaced_path(target_path)
+    target_path.rename(old_path)
+    try:
+        new_path.rename(target_path)
+    except OSError:
+        old_path.rename(target_path)
+        raise
+    return old_path
+
+
+def remove_tree(path: Path):
+    """Delete a directory tree, symlink or file."""
+    if path.is_symlink() or not path.is_dir():
+        path.unlink()
+    else:
+        shutil.rmtree(path)
+
+
+def discard_tree(path: Optional[Path]):
+    """Delete a displaced tree on the background cleanup thread."""
+    global _cleanup_executor
+    if path is None:
+        return
+    with _cleanup_lock:
+        if _cleanup_executor is None:
+            _cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='skill-cleanup')
+        _cleanup_executor.submit(remove_tree, path)
+
+
+def wait_for_cleanup():
+    """Block until every tree passed to discard_tree() has been deleted."""
+    global _cleanup_executor
+    with _cleanup_lock:
+        executor, _cleanup_executor = _cleanup_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def collect_stale_temps(directory: Path, max_age: float = STALE_TEMP_SECONDS) -> int:
+    """Delete abandoned '.<name>.tmp' and '.<name>.old-*' entries in directory.
+
+    Only entries not modified for max_age seconds are removed, so imports
+    running concurrently in other processes are left alone. Returns the
+    number removed.
+    """
+    if not directory.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        name = entry.name
+        if not name.startswith('.') or not (name.endswith('.tmp') or '.old-' in name):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                continue
+            remove_tree(Path(entry.path))
+            removed += 1
+        except OSError:
+            continue
+    return removed
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the BM25 skill routing index.
+
+Builds a router over thousands of synthetic skills and measures the full
+build, an incremental rebuild after a few skills change, save/load of the
+persisted index and query latency.
+
+Usage:
+    python benchmark_router.py                 # 5000 skills
+    python benchmark_router.py --skills 20000 --queries 2000
+"""
+
+import argparse
+import itertools
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from skill_router import SkillRouter
+
+WORDS = """
+pdf docx xlsx pptx csv json yaml markdown html image video audio chart diagram table report
+invoice contract email calendar slack github gitlab jira linear notion figma stripe aws gcp azure
+kubernetes docker terraform database postgres mysql sqlite redis kafka api rest graphql mcp server
+client test lint format review refactor debug deploy monitor log metric trace alert security audit
+translate summarize extract convert merge split compress encrypt sign validate schema migrate
+backup restore schedule notify search index rank classify cluster forecast analyze visualize
+""".split()
+
+
+class Vocabulary:
+    """Words drawn with Zipf-like frequencies, like terms in real descriptions."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.words = WORDS + [f"term{i}" for i in range(max(0, size - len(WORDS)))]
+        self.cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+        self.rng = rng
+
+    def sample(self, count: int) -> list:
+        return self.rng.choices(self.words, cum_weights=self.cum_weights, k=count)
+
+
+def make_skills(count: int, vocabulary: Vocabulary) -> dict:
+    """Synthetic installed-skill entries shaped like SkillIndex.skills."""
+    skills = {}
+    for i in range(count):
+        name = "-".join(vocabulary.sample(2) + [str(i)])
+        description = " ".join(vocabulary.sample(vocabulary.rng.randint(15, 40)))
+        skills[name] = {'name': name, 'description': f"Use when working with {description}."}
+    return skills
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the BM25 skill routing index")
+    parser.add_argument("--skills", type=int, default=5000, help="Number of synthetic skills (default: 5000)")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of queries to time (default: 1000)")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="Distinct words in descriptions (default: 20000)")
+    parser.add_argument("--changed", type=int, default=10, help="Skills changed for the incremental rebuild (default: 10)")
+    parser.add_argument("-k", type=int, default=5, help="Results per query (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = Vocabulary(args.vocabulary, rng)
+    skills = make_skills(args.skills, vocabulary)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target_dir = Path(tmp)
+
+        start = time.perf_counter()
+        router = SkillRouter(target_dir)
+        router.sync(skills)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        router.save()
+        save_time = time.perf_counter() - start
+        size = router.path.stat().st_size
+
+        for name in rng.sample(sorted(skills), args.changed):
+            skills[name] = {'name': name, 'description': skills[name]['description'] + " " + vocabulary.sample(1)[0]}
+        start = time.perf_counter()
+        router = SkillRouter(target_dir)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        changed = router.sync(skills)
+        incremental_time = time.perf_counter() - start
+
+        prompts = [" ".join(vocabulary.sample(rng.randint(3, 8))) for _ in range(args.queries)]
+        # The first query of a term builds its cached weights; time steady-state queries
+        for prompt in prompts:
+            router.query(prompt, args.k)
+        latencies = []
+        for prompt in prompts:
+            start = time.perf_counter()
+            router.query(prompt, args.k)
+            latencies.append(time.perf_counter() - start)
+
+    print(f"Skills:              {len(skills)} ({len(router.postings)} terms, index {size / 1024:.0f} KB)")
+    print(f"Full build:          {build_time * 1000:.1f}ms")
+    print(f"Save:                {save_time * 1000:.1f}ms")
+    print(f"Load:                {load_time * 1000:.1f}ms")
+    print(f"Incremental rebuild: {incremental_time * 1000:.1f}ms ({changed} changed)")
+    print(f"Query ({args.queries} prompts, k={args.k}): "
+          f"p50 {percentile(latencies, 50) * 1000:.3f}ms, p99 {percentile(latencies, 99) * 1000:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
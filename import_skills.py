@@ -15,162 +15,732 @@ Usage:
     python import_skills.py --symlink    # Symlink mode
     python import_skills.py --force      # Overwrite existing skills
     python import_skills.py --source DIR # Scan custom directory
+    python import_skills.py --source pdf.skill  # Install a packaged skill
+    python import_skills.py --jobs 8     # Import up to 8 skills in parallel
+    python import_skills.py --sync       # Update changed files only
+    python import_skills.py --copy-mode reflink  # Clone files copy-on-write
+    python import_skills.py --store      # Link into the content-addressed store
+    python import_skills.py --rollback   # Restore previous stored versions
+    python import_skills.py --gc         # Delete unreferenced stored versions
+    python import_skills.py --watch      # Keep syncing skills as they change
+    python import_skills.py query [TERM] # List installed skills from the index
+    python import_skills.py route PROMPT # Rank installed skills for a prompt
+    python import_skills.py remove NAME  # Uninstall a skill
 """
 
 import os
 import sys
 import shutil
 import argparse
-import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
+# The shared SKILL.md frontmatter parser and .skillignore matcher live with the skill-creator scripts
+PARSER_DIR = Path(__file__).resolve().parent / 'skills' / 'skill-creator' / 'scripts'
+if not (PARSER_DIR / 'frontmatter.py').is_file():
+    # Never fall back to an unrelated installed 'frontmatter' package
+    print(f"Error: SKILL.md frontmatter parser not found: {PARSER_DIR / 'frontmatter.py'}")
+    sys.exit(1)
+sys.path.insert(0, str(PARSER_DIR))
 
-def is_skill_dir(path: Path) -> bool:
-    """Check if a directory is a valid skill directory."""
-    return path.is_dir() and (path / "SKILL.md").exists()
+from atomic_replace import collect_stale_temps, discard_tree, remove_tree, replace_path, wait_for_cleanup
+from skill_archive import (SKILL_ARCHIVE_SUFFIX, ArchiveError, archive_skill_name, extract_archive,
+                           is_skill_archive, read_archive)
+from skill_index import SkillIndex
+from skill_router import SkillRouter
+from skill_store import DEFAULT_STORE_DIR, SkillStore, file_sha256
+from skill_watch import DEFAULT_DEBOUNCE, watch_skills
+from frontmatter import FrontmatterError, read_frontmatter
+from skillignore import SKILLIGNORE_NAME, is_excluded, read_ignore_rules
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-def find_skill_dirs(scan_dir: Path) -> List[Path]:
-    """Find all skill directories in the specified directory."""
+# Per-skill record of installed files, written inside each synced skill
+MANIFEST_NAME = '.skill-manifest.json'
+
+# Directories never searched for skills
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+# How file contents are duplicated into the target; see copy_file()
+COPY_MODES = ('copy', 'reflink', 'hardlink')
+
+# Linux ioctl that clones a file's extents copy-on-write (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+
+def discover_skill_dirs(scan_dir: Path, exclude_dir: Optional[Path] = None) -> Tuple[List[Path], int]:
+    """Recursively find skill directories and .skill archives below scan_dir.
+
+    Each directory is listed once with os.scandir; a directory containing
+    SKILL.md is a skill and is not descended into. Hidden directories,
+    SKIP_DIRS, exclude_dir (the install target) and anything matched by a
+    .skillignore file are pruned. Symlinked directories are accepted as
+    skills but never descended into, so link cycles cannot loop.
+    Returns (sorted skill directories and archives, directories scanned).
+    """
+    skill_dirs = []
+    dirs_scanned = 0
+    try:
+        # scandir reports inodes for free; samefile only runs on a match
+        exclude_inode = os.stat(exclude_dir).st_ino if exclude_dir else None
+    except OSError:
+        exclude_inode = None
+    # Iterative walk so deep trees cannot hit the recursion limit
+    # (directory, its path relative to scan_dir, .skillignore rules in effect)
+    stack = [(os.fspath(scan_dir), '', [])]
+
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        dirs_scanned += 1
+
+        names = {entry.name for entry in entries}
+        if 'SKILL.md' in names:
+            skill_dirs.append(Path(directory))
+            continue
+        if SKILLIGNORE_NAME in names:
+            rules = rules + read_ignore_rules(Path(directory, SKILLIGNORE_NAME), rel_dir)
+
+        for entry in entries:
+            if entry.name in SKIP_DIRS:
+                continue
+            is_archive = entry.name.endswith(SKILL_ARCHIVE_SUFFIX) and entry.is_file()
+            if not (is_archive or entry.is_dir()):
+                continue
+            if not is_archive and (entry.name.startswith('.') or (
+                    entry.inode() == exclude_inode and os.path.samefile(entry.path, exclude_dir))):
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if rules and is_excluded(rel_path, not is_archive, rules):
+                continue
+            if is_archive:
+                skill_dirs.append(Path(entry.path))
+                continue
+            if entry.is_symlink():
+                if os.path.isfile(os.path.join(entry.path, 'SKILL.md')):
+                    skill_dirs.append(Path(entry.path))
+                continue
+            stack.append((entry.path, rel_path, rules))
+
+    return sorted(skill_dirs), dirs_scanned
+
+
+def skill_install_name(source: Path) -> str:
+    """The directory name a skill directory or .skill archive installs under."""
+    if source.suffix == SKILL_ARCHIVE_SUFFIX and source.is_file():
+        return archive_skill_name(source)
+    return source.name
+
+
+def find_skill_dirs(scan_dir: Path, target_dir: Optional[Path] = None) -> List[Path]:
+    """Find all skill directories and .skill archives in the specified directory tree.
+
+    target_dir is never searched, so installed copies are not mistaken for sources.
+    """
     if not scan_dir.exists():
         print(f"Error: Directory '{scan_dir}' does not exist.")
         sys.exit(1)
+    if scan_dir.is_file():
+        if not is_skill_archive(scan_dir):
+            print(f"Error: '{scan_dir}' is neither a directory nor a {SKILL_ARCHIVE_SUFFIX} archive.")
+            sys.exit(1)
+        return [scan_dir]
 
-    skill_dirs = [d for d in scan_dir.iterdir() if is_skill_dir(d)]
+    start_time = time.perf_counter()
+    skill_dirs, dirs_scanned = discover_skill_dirs(scan_dir, target_dir)
+    elapsed = time.perf_counter() - start_time
+    print(f"Scanned {dirs_scanned} director{'y' if dirs_scanned == 1 else 'ies'} in {elapsed * 1000:.1f}ms")
 
     if not skill_dirs:
         print(f"Warning: No skill directories found in '{scan_dir}'")
         print("A skill directory must contain a SKILL.md file.")
 
-    return skill_dirs
+    # Skills are installed by directory name, so nested layouts can collide;
+    # the shallowest one wins
+    seen = {}
+    for skill_dir in sorted(skill_dirs, key=lambda path: (len(path.parts), path)):
+        name = skill_install_name(skill_dir)
+        if name in seen:
+            print(f"Warning: Ignoring {skill_dir}, same name as {seen[name]}")
+            continue
+        seen[name] = skill_dir
 
+    return sorted(seen.values())
 
-def extract_yaml_field(content: str, field_name: str) -> Optional[str]:
-    """
-    Extract a field value from YAML frontmatter with robust parsing.
 
-    Handles:
-    - Comments (lines starting with #)
-    - Quoted values (single and double quotes)
-    - Values with colons in them (e.g., URLs)
-    - Whitespace around colons
-    """
-    # Split into frontmatter and body
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return None
+def get_skill_name(skill_dir: Path) -> str:
+    """Extract skill name from SKILL.md frontmatter."""
+    try:
+        name = read_frontmatter(skill_dir / "SKILL.md").data.get('name')
+        if isinstance(name, str) and name.strip():
+            return name.strip()
+    except (OSError, FrontmatterError) as e:
+        print(f"Warning: Could not read SKILL.md: {e}")
+
+    # Fallback to directory name
+    return skill_dir.name
 
-    frontmatter = parts[1]
 
-    # Filter out comments and empty lines
-    lines = [
-        line for line in frontmatter.split('\n')
-        if line.strip() and not line.strip().startswith('#')
-    ]
+def format_bytes(num_bytes: int) -> str:
+    """Format a byte count for display."""
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
 
-    # Pattern to match: field: value
-    # Handles:
-    # - name: simple-value
-    # - name: "quoted value"
-    # - name: 'single quoted'
-    # - name: value:with:colons
-    pattern = rf'^{re.escape(field_name)}\s*:\s*(.+)$'
 
-    for line in lines:
-        match = re.match(pattern, line.strip())
-        if match:
-            value = match.group(1).strip()
+def copy_file(src, dst, copy_mode: str = 'copy') -> str:
+    """Copy src to dst with the requested strategy, falling back to a plain copy.
 
-            # Remove quotes if present
-            if (value.startswith('"') and value.endswith('"')) or \
-               (value.startswith("'") and value.endswith("'")):
-                value = value[1:-1]
+    'reflink' shares the source's data blocks copy-on-write, so the copy
+    costs no space until either file changes. 'hardlink' makes dst another
+    name for the source file: edits to one show up in the other. When the
+    filesystem cannot do either (different device, no reflink support) the
+    file is copied normally. Returns the strategy actually used.
+    """
+    if copy_mode == 'hardlink':
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError:
+            pass
+    elif copy_mode == 'reflink' and fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return 'reflink'
+        except OSError:
+            try:
+                os.unlink(dst)
+            except OSError:
+                pass
+    shutil.copy2(src, dst)
+    return 'copy'
 
-            return value
 
-    return None
+def add_bytes(totals: Dict[str, int], counts: Dict[str, int]):
+    """Add per-strategy byte counts into totals."""
+    for strategy, num_bytes in counts.items():
+        totals[strategy] = totals.get(strategy, 0) + num_bytes
 
 
-def get_skill_name(skill_dir: Path) -> str:
-    """Extract skill name from SKILL.md frontmatter."""
-    skill_md = skill_dir / "SKILL.md"
+def describe_bytes(bytes_by_strategy: Dict[str, int]) -> str:
+    """Summarize per-strategy byte counts, e.g. '1.2 MB reflink, 3 KB copy'."""
+    parts = [
+        f"{format_bytes(bytes_by_strategy[strategy])} {strategy}"
+        for strategy in COPY_MODES if bytes_by_strategy.get(strategy)
+    ]
+    return ", ".join(parts) if parts else format_bytes(0)
 
-    try:
-        with open(skill_md, 'r', encoding='utf-8') as f:
-            content = f.read()
 
-        name = extract_yaml_field(content, 'name')
-        if name:
-            return name
-    except Exception as e:
-        print(f"Warning: Could not read SKILL.md: {e}")
+def counting_copy_function(copy_mode: str, bytes_by_strategy: Dict[str, int]):
+    """Return a copytree copy_function that tallies bytes per copy strategy."""
+    def counting_copy(src, dst):
+        strategy = copy_file(src, dst, copy_mode)
+        bytes_by_strategy[strategy] = bytes_by_strategy.get(strategy, 0) + os.path.getsize(dst)
+        return dst
+    return counting_copy
 
-    # Fallback to directory name
-    return skill_dir.name
 
+def import_skill_copy(skill_dir: Path, target_dir: Path, force: bool,
+                      copy_mode: str = 'copy') -> Tuple[bool, str, Dict[str, int]]:
+    """Import a skill by copying it to the target directory.
 
-def import_skill_copy(skill_dir: Path, target_dir: Path, force: bool) -> Tuple[bool, str]:
-    """Import a skill by copying it to the target directory."""
+    Returns (success, message, bytes_by_strategy), where bytes_by_strategy
+    maps each copy strategy used (see copy_file) to the bytes it imported.
+    """
     skill_name = skill_dir.name
     target_path = target_dir / skill_name
 
     # Check if target already exists
     if target_path.exists():
         if not force:
-            return False, f"Skipped (already exists): {skill_name}"
-
-    try:
-        # Use a temporary directory for atomic operation
-        # This prevents data loss if copy fails
-        temp_path = target_dir / f".{skill_name}.tmp"
-        if temp_path.exists():
-            shutil.rmtree(temp_path)
+            return False, f"Skipped (already exists): {skill_name}", {}
 
-        # Copy to temporary location first
-        shutil.copytree(skill_dir, temp_path)
+    bytes_by_strategy = {}
 
-        # If target exists, remove it after successful copy
-        if target_path.exists():
-            shutil.rmtree(target_path)
+    temp_path = target_dir / f".{skill_name}.tmp"
+    try:
+        # Copy to a temporary directory first so a failed copy never touches the target
+        if temp_path.exists() or temp_path.is_symlink():
+            remove_tree(temp_path)
+        shutil.copytree(skill_dir, temp_path, copy_function=counting_copy_function(copy_mode, bytes_by_strategy))
 
-        # Move temporary to final location
-        temp_path.rename(target_path)
+        # Swap it into place; the old tree is deleted in the background
+        discard_tree(replace_path(temp_path, target_path))
 
-        return True, f"Copied: {skill_name}"
+        return True, f"Copied: {skill_name} ({describe_bytes(bytes_by_strategy)})", bytes_by_strategy
     except Exception as e:
         # Clean up temporary directory if it exists
-        temp_path = target_dir / f".{skill_name}.tmp"
         if temp_path.exists():
             try:
                 shutil.rmtree(temp_path)
             except Exception:
                 pass
-        return False, f"Error copying {skill_name}: {e}"
+        return False, f"Error copying {skill_name}: {e}", {}
+
 
+def import_skill_symlink(skill_dir: Path, target_dir: Path, force: bool) -> Tuple[bool, str, Dict[str, int]]:
+    """Import a skill by creating a symlink to the target directory.
 
-def import_skill_symlink(skill_dir: Path, target_dir: Path, force: bool) -> Tuple[bool, str]:
-    """Import a skill by creating a symlink to the target directory."""
+    Returns (success, message, bytes_by_strategy); symlinks copy no bytes.
+    """
     skill_name = skill_dir.name
     target_path = target_dir / skill_name
 
     # Check if target already exists
-    if target_path.exists():
-        if not force:
-            return False, f"Skipped (already exists): {skill_name}"
-        # Remove existing file/directory/link
-        if target_path.is_symlink():
-            target_path.unlink()
-        else:
-            shutil.rmtree(target_path)
+    if (target_path.exists() or target_path.is_symlink()) and not force:
+        return False, f"Skipped (already exists): {skill_name}", {}
 
+    temp_link = target_dir / f".{skill_name}.tmp"
     try:
+        if temp_link.exists() or temp_link.is_symlink():
+            remove_tree(temp_link)
         # Create absolute symlink for reliability
         abs_source = skill_dir.resolve()
-        target_path.symlink_to(abs_source)
-        return True, f"Symlinked: {skill_name} -> {abs_source}"
+        temp_link.symlink_to(abs_source)
+        discard_tree(replace_path(temp_link, target_path))
+        return True, f"Symlinked: {skill_name} -> {abs_source}", {}
     except Exception as e:
-        return False, f"Error symlinking {skill_name}: {e}"
+        return False, f"Error symlinking {skill_name}: {e}", {}
+
+
+def import_skill_archive(archive_path: Path, target_dir: Path, force: bool) -> Tuple[bool, str, Dict[str, int]]:
+    """Import a skill by streaming a .skill archive into the target directory.
+
+    The archive's central directory is validated before anything is
+    written; members are then decompressed straight into a temporary
+    directory that is swapped into place like a copied skill.
+    Returns (success, message, bytes_by_strategy).
+    """
+    skill_name = archive_skill_name(archive_path)
+    target_path = target_dir / skill_name
+
+    if (target_path.exists() or target_path.is_symlink()) and not force:
+        return False, f"Skipped (already exists): {skill_name}", {}
+
+    temp_path = target_dir / f".{skill_name}.tmp"
+    try:
+        if temp_path.exists() or temp_path.is_symlink():
+            remove_tree(temp_path)
+        contents = extract_archive(archive_path, temp_path)
+        if contents.name != skill_name:
+            raise ArchiveError(f"{archive_path.name} changed while importing")
+        discard_tree(replace_path(temp_path, target_path))
+    except (ArchiveError, OSError) as e:
+        if temp_path.exists():
+            shutil.rmtree(temp_path, ignore_errors=True)
+        return False, f"Error extracting {archive_path.name}: {e}", {}
+
+    # Every byte is written out, so extraction counts as copied
+    message = (f"Extracted: {skill_name} from {archive_path.name} "
+               f"({len(contents.members)} files, {format_bytes(contents.total_size)})")
+    return True, message, {'copy': contents.total_size}
+
+
+def describe_archive(archive_path: Path) -> str:
+    """Dry-run line for a .skill archive, validating it without extracting."""
+    try:
+        contents = read_archive(archive_path)
+    except ArchiveError as e:
+        return f"Error: {e}"
+    return (f"Would extract: {contents.name} from {archive_path.name} "
+            f"({len(contents.members)} files, {format_bytes(contents.total_size)})")
+
+
+def import_skill_store(skill_dir: Path, target_dir: Path, force: bool, store: SkillStore,
+                       copy_mode: str = 'copy') -> Tuple[bool, str, Dict[str, int]]:
+    """Import a skill through the content-addressed store and link it into place.
+
+    The skill is copied into the store only if its content is not stored yet;
+    the target is then switched atomically to a symlink into the store. A
+    target already linked to an older stored version is switched without
+    --force, since the old version stays available for rollback.
+    Returns (success, message, bytes_by_strategy).
+    """
+    skill_name = skill_dir.name
+    target_path = target_dir / skill_name
+    current = store.linked_version(target_path)
+
+    if current is None and (target_path.exists() or target_path.is_symlink()) and not force:
+        return False, f"Skipped (already exists): {skill_name}", {}
+
+    bytes_by_strategy = {}
+    try:
+        version, created = store.add(skill_dir, counting_copy_function(copy_mode, bytes_by_strategy))
+        if version == current:
+            return False, f"Skipped (unchanged): {skill_name} -> {version}", {}
+
+        store.link(version, target_path)
+    except (OSError, shutil.Error) as e:
+        return False, f"Error storing {skill_name}: {e}", {}
+
+    if created:
+        detail = f"new version, {describe_bytes(bytes_by_strategy)}"
+    else:
+        detail = "already in store"
+    action = f"Switched: {skill_name} {current} ->" if current else f"Linked: {skill_name} ->"
+    return True, f"{action} {version} ({detail})", bytes_by_strategy
+
+
+def rollback_skills(store: SkillStore, target_dir: Path, names: List[str], dry_run: bool = False,
+                    index: Optional[SkillIndex] = None) -> int:
+    """Roll store-linked skills in target_dir back one version; returns the error count."""
+    if names:
+        link_paths = [target_dir / name for name in names]
+    elif target_dir.is_dir():
+        link_paths = sorted(p for p in target_dir.iterdir() if store.linked_version(p))
+    else:
+        link_paths = []
+
+    errors = 0
+    for link_path in link_paths:
+        current = store.linked_version(link_path)
+        if current is None:
+            print(f"Error: {link_path.name} is not linked into the skill store")
+            errors += 1
+            continue
+        history = store.history(link_path)
+        if not history:
+            print(f"Skipped (no previous version): {link_path.name}")
+        elif dry_run:
+            print(f"Would roll back: {link_path.name} {current} -> {history[-1]}")
+        else:
+            version = store.rollback(link_path)
+            print(f"Rolled back: {link_path.name} {current} -> {version}")
+            if index is not None:
+                index.update(link_path.name)
+    return errors
+
+
+def scan_files(root: Path) -> Dict[str, os.stat_result]:
+    """Map every regular file under root (relative POSIX path) to its stat."""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_path = Path(dirpath) / filename
+            rel_path = full_path.relative_to(root).as_posix()
+            if rel_path == MANIFEST_NAME:
+                continue
+            files[rel_path] = full_path.stat()
+    return files
+
+
+def load_manifest(skill_path: Path) -> Dict[str, dict]:
+    """Load the file manifest of an installed skill, or {} if there is none."""
+    try:
+        with open(skill_path / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(skill_path: Path, source: Path, files: Dict[str, dict]):
+    """Atomically write the file manifest of an installed skill."""
+    temp_path = skill_path / f"{MANIFEST_NAME}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'source': str(source), 'files': files}, f, indent=2, sort_keys=True)
+    os.replace(temp_path, skill_path / MANIFEST_NAME)
+
+
+def plan_sync(skill_dir: Path, target_path: Path) -> dict:
+    """Work out which files must be added, changed or removed in target_path.
+
+    A source file whose size and mtime match the manifest is assumed
+    unchanged without hashing; otherwise its hash is compared against the
+    manifest (or the installed file when there is no manifest entry).
+    """
+    manifest = load_manifest(target_path)
+    source_files = scan_files(skill_dir)
+    target_files = scan_files(target_path) if target_path.is_dir() else {}
+
+    plan = {'added': [], 'changed': [], 'removed': [], 'files': {}, 'manifest_stale': False}
+
+    for rel_path, st in sorted(source_files.items()):
+        entry = manifest.get(rel_path)
+        installed = target_files.get(rel_path)
+
+        if entry and installed and installed.st_size == entry['size'] \
+                and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            plan['files'][rel_path] = entry
+            continue
+
+        digest = file_sha256(skill_dir / rel_path)
+        record = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+        plan['files'][rel_path] = record
+
+        if installed is None:
+            plan['added'].append((rel_path, st.st_size))
+        elif installed.st_size == st.st_size and digest == (
+                entry['sha256'] if entry else file_sha256(target_path / rel_path)):
+            plan['manifest_stale'] = True
+        else:
+            plan['changed'].append((rel_path, st.st_size))
+
+    for rel_path in sorted(set(target_files) - set(source_files)):
+        plan['removed'].append((rel_path, target_files[rel_path].st_size))
+
+    if set(manifest) != set(plan['files']):
+        plan['manifest_stale'] = True
+
+    return plan
+
+
+def describe_plan(plan: dict) -> str:
+    """Summarize a sync plan as counts with byte totals."""
+    parts = []
+    for key, sign in (('added', '+'), ('changed', '~'), ('removed', '-')):
+        if plan[key]:
+            total = sum(size for _, size in plan[key])
+            parts.append(f"{sign}{len(plan[key])} {key} {format_bytes(total)}")
+    return ", ".join(parts) if parts else "no changes"
+
+
+def sync_skill(skill_dir: Path, target_dir: Path, dry_run: bool = False,
+               copy_mode: str = 'copy') -> Tuple[bool, str, Dict[str, int]]:
+    """Incrementally sync a skill into the target directory.
+
+    Only added or changed files are copied and files no longer in the source
+    are deleted; a skill with no changes is left untouched. A source without
+    SKILL.md (deleted, or mid-checkout) is refused rather than treated as
+    empty, which would delete every installed file. Returns
+    (success, message, bytes_by_strategy).
+    """
+    skill_name = skill_dir.name
+    target_path = target_dir / skill_name
+
+    if not (skill_dir / 'SKILL.md').is_file():
+        return False, f"Error syncing {skill_name}: {skill_dir / 'SKILL.md'} not found", {}
+
+    bytes_by_strategy = {}
+    try:
+        # A symlink or file at the target is swapped for a full copy
+        replace = target_path.is_symlink() or (target_path.exists() and not target_path.is_dir())
+
+        if replace or not target_path.exists():
+            if dry_run:
+                if replace:
+                    return True, f"Would replace with copy: {skill_name}", {}
+                total = sum(st.st_size for st in scan_files(skill_dir).values())
+                return True, f"Would copy: {skill_name} ({format_bytes(total)})", {}
+            success, message, bytes_by_strategy = import_skill_copy(skill_dir, target_dir, replace, copy_mode)
+            if success:
+                write_manifest(target_path, skill_dir.resolve(), plan_sync(skill_dir, target_path)['files'])
+            return success, message, bytes_by_strategy
+
+        plan = plan_sync(skill_dir, target_path)
+        has_changes = plan['added'] or plan['changed'] or plan['removed']
+
+        if dry_run:
+            if not has_changes:
+                return False, f"Skipped (unchanged): {skill_name}", {}
+            lines = [f"Would sync: {skill_name} ({describe_plan(plan)})"]
+            for key, sign in (('added', '+'), ('changed', '~'), ('removed', '-')):
+                lines.extend(f"    {sign} {rel_path} ({format_bytes(size)})" for rel_path, size in plan[key])
+            return True, "\n".join(lines), {}
+
+        if not has_changes:
+            if plan['manifest_stale']:
+                write_manifest(target_path, skill_dir.resolve(), plan['files'])
+            return False, f"Skipped (unchanged): {skill_name}", {}
+
+        for rel_path, size in plan['added'] + plan['changed']:
+            destination = target_path / rel_path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            # Copy beside the destination and rename so readers never see a partial file
+            temp_file = destination.with_name(f".{destination.name}.tmp")
+            if temp_file.exists():
+                temp_file.unlink()
+            strategy = copy_file(skill_dir / rel_path, temp_file, copy_mode)
+            os.replace(temp_file, destination)
+            bytes_by_strategy[strategy] = bytes_by_strategy.get(strategy, 0) + size
+
+        for rel_path, _ in plan['removed']:
+            (target_path / rel_path).unlink()
+            # Prune directories emptied by the removal
+            parent = (target_path / rel_path).parent
+            while parent != target_path and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+
+        write_manifest(target_path, skill_dir.resolve(), plan['files'])
+    except OSError as e:
+        # Any filesystem failure is this skill's error, never an exception out of the import pool
+        return False, f"Error syncing {skill_name}: {e}", bytes_by_strategy
+
+    return True, f"Synced: {skill_name} ({describe_plan(plan)})", bytes_by_strategy
+
+
+def resolve_target(args) -> Tuple[Path, str]:
+    """Return (target directory, location description) from the target options."""
+    if args.target:
+        # Custom target overrides local/global
+        return args.target, "custom"
+    if args.local and args.global_dir:
+        print("Error: --local and --global-dir are mutually exclusive")
+        sys.exit(1)
+    if args.local:
+        # Local project directory (always relative to current working directory, not source)
+        return Path.cwd() / '.claude' / 'skills', "local project"
+    # Global directory (default)
+    return Path.home() / '.claude' / 'skills', "global"
+
+
+def save_index(index: SkillIndex, router: Optional[SkillRouter] = None,
+               changed: Optional[List[str]] = None):
+    """Write the installed-skill index and bring the routing index in line with it.
+
+    With changed, only those skills' routing documents are updated instead of
+    comparing every skill. An already loaded router can be passed to skip
+    reading it again.
+    """
+    index.save()
+    if router is None:
+        router = SkillRouter(index.target_dir)
+    if changed is None:
+        router.sync(index.skills)
+    else:
+        for dir_name in changed:
+            entry = index.skills.get(dir_name)
+            if entry:
+                router.add(dir_name, entry['name'], entry['description'])
+            else:
+                router.remove(dir_name)
+    router.save()
+
+
+def query_command(args):
+    """List installed skills from the target's index."""
+    target_dir, location_type = resolve_target(args)
+
+    start_time = time.perf_counter()
+    index = SkillIndex(target_dir)
+    if not args.no_refresh:
+        index.refresh()
+        save_index(index)
+    results = index.query(args.term)
+    elapsed = time.perf_counter() - start_time
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for entry in results:
+        description = entry['description']
+        if len(description) > 80:
+            description = description[:77] + "..."
+        name = entry['name'] if entry['name'] == entry['dir'] else f"{entry['name']} ({entry['dir']})"
+        print(f"{name:<32} {format_bytes(entry['size']):>9}  {entry['hash'][:12]}  {description}")
+    print(f"\n{len(results)} of {len(index.skills)} skill(s) in {target_dir} ({location_type}), "
+          f"listed in {elapsed * 1000:.1f}ms")
+
+
+def route_command(args):
+    """Print the installed skills most relevant to a prompt."""
+    target_dir, _ = resolve_target(args)
+    start_time = time.perf_counter()
+    router = SkillRouter(target_dir)
+    load_time = time.perf_counter() - start_time
+
+    index = SkillIndex(target_dir)
+    index.refresh()
+    save_index(index, router)
+    start_time = time.perf_counter()
+    results = router.query(args.prompt, args.top)
+    query_time = time.perf_counter() - start_time
+
+    if args.json:
+        print(json.dumps([
+            {'dir': dir_name, 'score': score, **index.skills[dir_name]} for dir_name, score in results
+        ], indent=2))
+        return
+
+    for rank, (dir_name, score) in enumerate(results, 1):
+        entry = index.skills[dir_name]
+        description = entry['description']
+        if len(description) > 80:
+            description = description[:77] + "..."
+        print(f"{rank:>2}. {dir_name:<32} {score:>6.2f}  {description}")
+    if not results:
+        print("No installed skill matches the prompt.")
+    print(f"\n{len(results)} of {len(router.docs)} skill(s); index loaded in {load_time * 1000:.1f}ms, "
+          f"query took {query_time * 1000:.2f}ms")
+
+
+def remove_command(args):
+    """Uninstall skills from the target and drop them from its index."""
+    target_dir, location_type = resolve_target(args)
+    index = SkillIndex(target_dir)
+
+    error_count = 0
+    removed = []
+    for name in args.skills:
+        skill_path = target_dir / name
+        if not (skill_path.exists() or skill_path.is_symlink()):
+            print(f"Error: {name} is not installed in {target_dir}")
+            error_count += 1
+            continue
+        if args.dry_run:
+            print(f"Would remove: {name}")
+            continue
+        try:
+            if skill_path.is_symlink() or not skill_path.is_dir():
+                skill_path.unlink()
+            else:
+                shutil.rmtree(skill_path)
+        except OSError as e:
+            print(f"Error removing {name}: {e}")
+            error_count += 1
+            continue
+        index.remove(name)
+        removed.append(name)
+        print(f"Removed: {name}")
+
+    save_index(index, changed=removed)
+    if error_count > 0:
+        sys.exit(1)
+
+
+def add_target_options(parser: argparse.ArgumentParser, subcommand: bool = False):
+    """Add --local, --global-dir and --target, shared by the import and the subcommands.
+
+    A subparser's defaults would overwrite options given before the
+    subcommand (e.g. '--target T query'), so subcommands suppress them and
+    only set the options that appear after the subcommand.
+    """
+    def default(value):
+        return argparse.SUPPRESS if subcommand else value
+
+    parser.add_argument(
+        '--local',
+        action='store_true',
+        default=default(False),
+        help='Use the local project .claude/skills/ (project-specific)'
+    )
+    parser.add_argument(
+        '--global-dir',
+        action='store_true',
+        default=default(False),
+        help='Use the global ~/.claude/skills/ (available in all projects) [default]'
+    )
+    parser.add_argument(
+        '--target', '-t',
+        type=Path,
+        default=default(None),
+        help='Custom target directory (overrides --local and --global-dir)'
+    )
 
 
 def main():
@@ -193,18 +763,47 @@ Examples:
 
   # Preview before importing
   python import_skills.py --dry-run
+
+  # Import many skills in parallel
+  python import_skills.py --force --jobs 8
+
+  # Install a packaged skill, or every .skill archive in a directory
+  python import_skills.py --source dist/pdf.skill --local
+  python import_skills.py --source dist --jobs 8
+
+  # Update installed skills, copying only changed files
+  python import_skills.py --sync
+
+  # Show which files a sync would add, change or remove
+  python import_skills.py --sync --dry-run
+
+  # Clone files copy-on-write where the filesystem supports it
+  python import_skills.py --local --copy-mode reflink
+
+  # Sync, then keep the local copies up to date while editing
+  python import_skills.py --local --watch
+
+  # Store each skill version once and link projects into the store
+  python import_skills.py --local --store
+
+  # Switch linked skills back to their previous version
+  python import_skills.py --local --rollback
+
+  # Delete stored versions no target uses any more
+  python import_skills.py --gc
+
+  # List installed skills, or those matching a term, from the index
+  python import_skills.py query
+  python import_skills.py query pdf --local
+
+  # The installed skills most relevant to a prompt
+  python import_skills.py route "build an MCP server for the GitHub API" -k 3
+
+  # Uninstall skills
+  python import_skills.py remove old-skill --local
         """
     )
-    parser.add_argument(
-        '--local',
-        action='store_true',
-        help='Import to local project .claude/skills/ (project-specific)'
-    )
-    parser.add_argument(
-        '--global-dir',
-        action='store_true',
-        help='Import to global ~/.claude/skills/ (available in all projects) [default]'
-    )
+    add_target_options(parser)
     parser.add_argument(
         '--copy',
         action='store_true',
@@ -221,93 +820,280 @@ Examples:
         help='Overwrite existing skills in the target directory'
     )
     parser.add_argument(
-        '--source', '-s',
+        '--copy-mode',
+        choices=COPY_MODES,
+        default='copy',
+        help='How copied files are written: copy (default), reflink (copy-on-write clone) '
+             'or hardlink (shares the source file; edits affect both). '
+             'Falls back to copy when the filesystem does not support the mode'
+    )
+    parser.add_argument(
+        '--store',
+        action='store_true',
+        help='Keep each skill version once in the content-addressed store and symlink targets into it'
+    )
+    parser.add_argument(
+        '--store-dir',
         type=Path,
-        default=Path.cwd() / 'skills',
-        help='Source directory to scan for skills (default: ./skills/)'
+        default=DEFAULT_STORE_DIR,
+        help=f'Skill store location (default: {DEFAULT_STORE_DIR})'
     )
     parser.add_argument(
-        '--target', '-t',
+        '--rollback',
+        nargs='*',
+        metavar='SKILL',
+        help='Switch store-linked skills in the target back to their previous version (default: all)'
+    )
+    parser.add_argument(
+        '--gc',
+        action='store_true',
+        help='Delete stored versions that no target links to'
+    )
+    parser.add_argument(
+        '--keep',
+        type=int,
+        default=1,
+        help='Previous versions per target that --gc keeps for rollback (default: 1)'
+    )
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Incrementally update existing skills: copy changed files, delete removed ones'
+    )
+    parser.add_argument(
+        '--watch', '-w',
+        action='store_true',
+        help='After importing, keep syncing skills as their files change (implies --sync)'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=DEFAULT_DEBOUNCE * 1000,
+        help=f'Milliseconds without further changes before a watched skill is synced '
+             f'(default: {DEFAULT_DEBOUNCE * 1000:.0f})'
+    )
+    parser.add_argument(
+        '--source', '-s',
         type=Path,
-        default=None,
-        help='Custom target directory (overrides --local and --global)'
+        default=Path.cwd() / 'skills',
+        help='Source directory to scan for skill directories and .skill archives, '
+             'or a single .skill archive (default: ./skills/)'
     )
     parser.add_argument(
         '--dry-run',
         action='store_true',
         help='Show what would be done without actually doing it'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of skills (or archives extracted) to import in parallel (default: 1)'
+    )
+
+    subparsers = parser.add_subparsers(dest='command', metavar='{query,route,remove}')
+    query_parser = subparsers.add_parser(
+        'query', help='List installed skills from the index'
+    )
+    add_target_options(query_parser, subcommand=True)
+    query_parser.add_argument('term', nargs='?', help='Only list skills whose name or description contains this')
+    query_parser.add_argument('--json', action='store_true', help='Print entries as JSON')
+    query_parser.add_argument(
+        '--no-refresh', action='store_true',
+        help='Read the index only, without checking the target directory for changes'
+    )
+    route_parser = subparsers.add_parser(
+        'route', help='Rank installed skills by relevance to a prompt (BM25)'
+    )
+    add_target_options(route_parser, subcommand=True)
+    route_parser.add_argument('prompt', help='Prompt or task description to route')
+    route_parser.add_argument('-k', '--top', type=int, default=5, help='Number of skills to return (default: 5)')
+    route_parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    remove_parser = subparsers.add_parser(
+        'remove', help='Uninstall skills and drop them from the index'
+    )
+    add_target_options(remove_parser, subcommand=True)
+    remove_parser.add_argument('skills', nargs='+', metavar='SKILL', help='Installed skill directory names')
+    remove_parser.add_argument('--dry-run', action='store_true', help='Show what would be removed')
 
     args = parser.parse_args()
 
+    if args.command == 'query':
+        query_command(args)
+        return
+    if args.command == 'route':
+        if args.top < 1:
+            print("Error: -k/--top must be at least 1")
+            sys.exit(1)
+        route_command(args)
+        return
+    if args.command == 'remove':
+        remove_command(args)
+        return
+
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+
+    if args.watch:
+        if args.symlink or args.store or args.dry_run:
+            print("Error: --watch cannot be combined with --symlink, --store or --dry-run")
+            sys.exit(1)
+        args.sync = True
+
     # Determine mode
     use_symlink = args.symlink
     if args.copy and args.symlink:
         print("Error: --copy and --symlink are mutually exclusive")
         sys.exit(1)
+    if args.sync and args.symlink:
+        print("Error: --sync and --symlink are mutually exclusive")
+        sys.exit(1)
+    if args.store and (args.symlink or args.sync):
+        print("Error: --store cannot be combined with --symlink or --sync")
+        sys.exit(1)
+    if args.store and args.copy_mode == 'hardlink':
+        # Hardlinks would let edits to the source change a stored version
+        print("Error: --store cannot be combined with --copy-mode hardlink")
+        sys.exit(1)
+    if args.keep < 0:
+        print("Error: --keep must be 0 or more")
+        sys.exit(1)
 
     # Determine target directory
-    if args.target:
-        # Custom target overrides local/global
-        target_dir = args.target
-        location_type = "custom"
-    elif args.local and args.global_dir:
-        print("Error: --local and --global-dir are mutually exclusive")
-        sys.exit(1)
-    elif args.local:
-        # Local project directory (always relative to current working directory, not source)
-        target_dir = Path.cwd() / '.claude' / 'skills'
-        location_type = "local project"
-    else:
-        # Global directory (default)
-        target_dir = Path.home() / '.claude' / 'skills'
-        location_type = "global"
+    target_dir, location_type = resolve_target(args)
+    index = SkillIndex(target_dir)
+
+    store = SkillStore(args.store_dir) if args.store or args.gc or args.rollback is not None else None
+
+    # Store maintenance runs instead of an import
+    if args.rollback is not None or args.gc:
+        error_count = 0
+        if args.rollback is not None:
+            print(f"Rolling back skills in {target_dir} ({location_type})\n")
+            error_count += rollback_skills(store, target_dir, args.rollback, args.dry_run, index)
+        if args.gc:
+            removed = store.gc(keep=args.keep, dry_run=args.dry_run)
+            verb = "Would remove" if args.dry_run else "Removed"
+            for version, size in removed:
+                print(f"{verb}: {version} ({format_bytes(size)})")
+            kept = len(store.versions()) - (len(removed) if args.dry_run else 0)
+            print(f"\nStore: {store.root}")
+            print(f"  {verb} {len(removed)} version(s), {format_bytes(sum(size for _, size in removed))}; "
+                  f"{kept} kept")
+        save_index(index)
+        wait_for_cleanup()
+        if error_count > 0:
+            sys.exit(1)
+        return
 
     # Setup target directory
     if not args.dry_run:
         target_dir.mkdir(parents=True, exist_ok=True)
+        stale_count = collect_stale_temps(target_dir)
+        if stale_count:
+            print(f"Removed {stale_count} stale temporary director{'y' if stale_count == 1 else 'ies'} from {target_dir}")
 
     # Find skill directories
     print(f"Scanning '{args.source}' for skills...")
-    skill_dirs = find_skill_dirs(args.source)
+    skill_dirs = find_skill_dirs(args.source, target_dir)
     print(f"Found {len(skill_dirs)} skill(s)")
     print(f"Target: {target_dir} ({location_type})\n")
 
     # Import each skill
     success_count = 0
+    would_count = 0
     skip_count = 0
     error_count = 0
+    bytes_by_strategy = {}
 
-    for skill_dir in skill_dirs:
-        if args.dry_run:
-            mode = "symlink" if use_symlink else "copy"
-            print(f"Would {mode}: {skill_dir.name}")
-            continue
-
+    def import_one(skill_dir: Path) -> Tuple[bool, str, Dict[str, int]]:
+        if skill_dir.suffix == SKILL_ARCHIVE_SUFFIX and skill_dir.is_file():
+            if args.sync or args.store or use_symlink:
+                return False, f"Error importing {skill_dir.name}: archives cannot be used with --sync, --store or --symlink", {}
+            return import_skill_archive(skill_dir, target_dir, args.force)
+        if args.sync:
+            return sync_skill(skill_dir, target_dir, args.dry_run, args.copy_mode)
+        if args.store:
+            return import_skill_store(skill_dir, target_dir, args.force, store, args.copy_mode)
         if use_symlink:
-            success, message = import_skill_symlink(skill_dir, target_dir, args.force)
-        else:
-            success, message = import_skill_copy(skill_dir, target_dir, args.force)
+            return import_skill_symlink(skill_dir, target_dir, args.force)
+        return import_skill_copy(skill_dir, target_dir, args.force, args.copy_mode)
 
-        print(message)
+    start_time = time.perf_counter()
 
-        if success:
-            success_count += 1
-        elif "Skipped" in message:
-            skip_count += 1
-        else:
-            error_count += 1
+    if args.dry_run and not args.sync:
+        mode = "store" if args.store else "symlink" if use_symlink else "copy"
+        for skill_dir in skill_dirs:
+            if skill_dir.suffix == SKILL_ARCHIVE_SUFFIX and skill_dir.is_file():
+                print(describe_archive(skill_dir))
+            else:
+                print(f"Would {mode}: {skill_dir.name}")
+        would_count = len(skill_dirs)
+    else:
+        # Results are consumed in input order, so output is the same for any --jobs
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            for skill_dir, (success, message, skill_bytes) in zip(skill_dirs, executor.map(import_one, skill_dirs)):
+                print(message)
+                add_bytes(bytes_by_strategy, skill_bytes)
+                if not args.dry_run and (success or "Skipped" in message):
+                    index.update(skill_install_name(skill_dir))
+
+                if success and args.dry_run:
+                    would_count += 1
+                elif success:
+                    success_count += 1
+                elif "Skipped" in message:
+                    skip_count += 1
+                else:
+                    error_count += 1
+
+    save_index(index)
+    elapsed = time.perf_counter() - start_time
+    # Replaced trees were deleted in the background while later skills imported
+    wait_for_cleanup()
 
     # Summary
     print(f"\n{'='*60}")
     print(f"Import complete!")
     print(f"  Location: {location_type}")
-    print(f"  Imported: {success_count}")
+    if args.dry_run:
+        print(f"  Would import: {would_count}")
+    else:
+        print(f"  Imported: {success_count}")
     print(f"  Skipped:  {skip_count}")
     print(f"  Errors:   {error_count}")
+    print(f"  Copied:   {format_bytes(sum(bytes_by_strategy.values()))} in {elapsed:.2f}s")
+    if args.copy_mode != 'copy' and not use_symlink:
+        # Reflinked and hardlinked bytes share storage with the source
+        saved = bytes_by_strategy.get('reflink', 0) + bytes_by_strategy.get('hardlink', 0)
+        print(f"  Strategy: {describe_bytes(bytes_by_strategy)} (saved {format_bytes(saved)})")
     print(f"  Target:   {target_dir}")
+    if store:
+        print(f"  Store:    {store.root} ({len(store.versions())} version(s))")
     print(f"{'='*60}")
 
+    # Archives have no source files to watch
+    watched_dirs = [d for d in skill_dirs if d.is_dir()]
+    if args.watch and watched_dirs:
+        print()
+        # Loaded once; each sync re-indexes only the skill it changed
+        router = SkillRouter(target_dir)
+
+        def sync_and_index(skill_dir: Path) -> Tuple[bool, str, Dict[str, int]]:
+            result = sync_skill(skill_dir, target_dir, copy_mode=args.copy_mode)
+            if result[0]:
+                index.update(skill_dir.name)
+                save_index(index, router, [skill_dir.name])
+            return result
+
+        latencies = watch_skills(watched_dirs, sync_and_index, debounce=args.debounce / 1000)
+        wait_for_cleanup()
+        if latencies:
+            latencies.sort()
+            print(f"\nSynced {len(latencies)} change(s); latency after first change: "
+                  f"median {latencies[len(latencies) // 2] * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+
     if error_count > 0:
         sys.exit(1)
 
@@ -0,0 +1,148 @@
+"""
+Install skills straight from .skill archives.
+
+A .skill file is the zip written by skill-creator's package_skill.py: one
+top-level directory named after the skill, containing SKILL.md. Archives
+are checked against their central directory before anything is written;
+that read never touches the member data. Members are then streamed
+directly into the destination without an intermediate unpack.
+"""
+
+import os
+import shutil
+import stat
+import time
+import zipfile
+import zlib
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import List, NamedTuple
+
+SKILL_ARCHIVE_SUFFIX = '.skill'
+
+# Refuse archives that would expand beyond this (zip bombs)
+MAX_UNCOMPRESSED_SIZE = 1 << 30
+MAX_COMPRESSION_RATIO = 1000
+
+SUPPORTED_COMPRESSION = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    """A .skill archive is unreadable or unsafe to extract."""
+
+
+class ArchiveContents(NamedTuple):
+    # Top-level directory name, which is the skill's install name
+    name: str
+    members: List[zipfile.ZipInfo]
+    total_size: int
+
+
+def is_skill_archive(path: Path) -> bool:
+    return path.suffix == SKILL_ARCHIVE_SUFFIX and path.is_file()
+
+
+def validate_archive(zf: zipfile.ZipFile) -> ArchiveContents:
+    """Check every central directory entry of an open .skill archive.
+
+    Rejects absolute, parent-relative or '.' paths, symlinks, encrypted or
+    unsupported entries, duplicates (compared after normalizing the path),
+    more than one top-level directory, a missing SKILL.md and archives that
+    would expand too far.
+    """
+    top_levels = set()
+    seen = set()
+    members = []
+    total_size = 0
+
+    for info in zf.infolist():
+        name = info.filename
+        parts = PurePosixPath(name).parts
+        # PurePosixPath drops '.' components, so check the raw name for them
+        if (name.startswith('/') or '\\' in name or not parts or '..' in parts or '.' in name.split('/')
+                or ':' in parts[0]):
+            raise ArchiveError(f"Unsafe path in archive: {name!r}")
+        if stat.S_ISLNK(info.external_attr >> 16):
+            raise ArchiveError(f"Symlinks are not allowed in skill archives: {name!r}")
+        top_levels.add(parts[0])
+        if info.is_dir():
+            continue
+        if len(parts) < 2:
+            raise ArchiveError(f"File outside the skill directory: {name!r}")
+        if info.flag_bits & 0x1:
+            raise ArchiveError(f"Encrypted entry: {name!r}")
+        if info.compress_type not in SUPPORTED_COMPRESSION:
+            raise ArchiveError(f"Unsupported compression method {info.compress_type} for {name!r}")
+        # 'pdf//x' and 'pdf/x' extract to the same file
+        normalized = '/'.join(parts)
+        if normalized in seen:
+            raise ArchiveError(f"Duplicate entry: {name!r}")
+        if info.file_size > MAX_COMPRESSION_RATIO * max(info.compress_size, 1024):
+            raise ArchiveError(f"Suspicious compression ratio for {name!r}")
+        seen.add(normalized)
+        total_size += info.file_size
+        members.append(info)
+
+    if len(top_levels) != 1:
+        raise ArchiveError(f"Expected one top-level skill directory, found {len(top_levels)}")
+    skill_name = top_levels.pop()
+    if f"{skill_name}/SKILL.md" not in seen:
+        raise ArchiveError(f"{skill_name}/SKILL.md not found in archive")
+    if total_size > MAX_UNCOMPRESSED_SIZE:
+        raise ArchiveError(f"Archive expands to {total_size} bytes, more than the {MAX_UNCOMPRESSED_SIZE} limit")
+
+    return ArchiveContents(skill_name, members, total_size)
+
+
+def read_archive(path: Path) -> ArchiveContents:
+    """Open and validate a .skill archive (central directory only)."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return validate_archive(zf)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ArchiveError(f"Cannot read {path.name}: {e}")
+
+
+@lru_cache(maxsize=None)
+def archive_skill_name(path: Path) -> str:
+    """The name a .skill archive installs under, falling back to its file stem."""
+    try:
+        return read_archive(path).name
+    except ArchiveError:
+        return path.stem
+
+
+def extract_archive(path: Path, destination: Path) -> ArchiveContents:
+    """Validate a .skill archive and stream its skill directory into destination.
+
+    destination must not exist; it becomes the skill directory itself. CRCs
+    are verified as each member is read, and executable bits and
+    modification times are restored. Corrupt member data raises
+    ArchiveError; the partly written destination is left for the caller.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            contents = validate_archive(zf)
+            destination.mkdir()
+            for info in contents.members:
+                rel_path = PurePosixPath(info.filename).relative_to(contents.name)
+                target = destination.joinpath(*rel_path.parts)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                mode = info.external_attr >> 16
+                if mode & 0o111:
+                    os.chmod(target, os.stat(target).st_mode | (mode & 0o111))
+                mtime = zipfile_mtime(info)
+                os.utime(target, (mtime, mtime))
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, zlib.error, EOFError) as e:
+        # Damaged member data (zlib.error) or a truncated stream (EOFError)
+        raise ArchiveError(f"Corrupt archive: {e}")
+    return contents
+
+
+def zipfile_mtime(info: zipfile.ZipInfo) -> float:
+    """A member's modification time as a timestamp (zip times are local time)."""
+    return time.mktime(info.date_time + (0, 0, -1))
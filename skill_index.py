@@ -0,0 +1,146 @@
+"""
+Registry of the skills installed in a target directory.
+
+The index is a single JSON file (.skill-index.json) in the target directory
+holding the name, description, content hash, size and mtime of every
+installed skill, so listing installed skills reads one file instead of every
+SKILL.md. import_skills.py updates entries as it imports, syncs, rolls back
+or removes skills; refresh() picks up changes made by other tools.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from skill_store import tree_digest, tree_fingerprint, walk_files
+
+# The shared SKILL.md frontmatter parser lives with the skill-creator scripts
+_PARSER_DIR = Path(__file__).resolve().parent / 'skills' / 'skill-creator' / 'scripts'
+if not (_PARSER_DIR / 'frontmatter.py').is_file():
+    # Never fall back to an unrelated installed 'frontmatter' package
+    raise ImportError(f"SKILL.md frontmatter parser not found: {_PARSER_DIR / 'frontmatter.py'}")
+if str(_PARSER_DIR) not in sys.path:
+    sys.path.insert(0, str(_PARSER_DIR))
+from frontmatter import FrontmatterError, read_frontmatter
+
+INDEX_NAME = '.skill-index.json'
+INDEX_VERSION = 1
+
+# Written into installed skills by import_skills.py --sync; not skill content
+INSTALL_METADATA = {'.skill-manifest.json'}
+
+
+def skill_md_signature(skill_path: Path) -> Optional[List[int]]:
+    """[size, mtime_ns] of a skill's SKILL.md, or None if it has none."""
+    try:
+        st = (skill_path / 'SKILL.md').stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class SkillIndex:
+    """The installed-skill index of one target directory."""
+
+    def __init__(self, target_dir: Path):
+        self.target_dir = target_dir
+        self.path = target_dir / INDEX_NAME
+        self.skills: Dict[str, dict] = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != INDEX_VERSION:
+            return {}
+        return data.get('skills', {})
+
+    def save(self):
+        """Atomically write the index if it changed."""
+        if not self.dirty:
+            return
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{INDEX_NAME}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'skills': self.skills}, f, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def update(self, dir_name: str) -> Optional[dict]:
+        """Re-index one installed skill, or drop it if it is gone.
+
+        Files are only re-hashed when their paths, sizes or mtimes changed.
+        Returns the new entry, or None if the skill is not installed.
+        """
+        skill_path = self.target_dir / dir_name
+        signature = skill_md_signature(skill_path)
+        if signature is None:
+            self.remove(dir_name)
+            return None
+
+        files = [(rel_path, path) for rel_path, path in walk_files(skill_path) if rel_path not in INSTALL_METADATA]
+        fingerprint = tree_fingerprint(files)
+        entry = self.skills.get(dir_name)
+        if entry and entry['fingerprint'] == fingerprint and entry['skill_md'] == signature:
+            return entry
+
+        try:
+            data = read_frontmatter(skill_path / 'SKILL.md').data
+        except (OSError, FrontmatterError):
+            data = {}
+        stats = [path.stat() for _, path in files]
+        entry = {
+            'name': str(data.get('name') or dir_name).strip(),
+            'description': ' '.join(str(data.get('description') or '').split()),
+            'hash': tree_digest(files),
+            'size': sum(st.st_size for st in stats),
+            'files': len(files),
+            'mtime_ns': max((st.st_mtime_ns for st in stats), default=0),
+            'link': os.readlink(skill_path) if skill_path.is_symlink() else None,
+            'skill_md': signature,
+            'fingerprint': fingerprint,
+        }
+        self.skills[dir_name] = entry
+        self.dirty = True
+        return entry
+
+    def remove(self, dir_name: str):
+        if self.skills.pop(dir_name, None) is not None:
+            self.dirty = True
+
+    def refresh(self) -> int:
+        """Reconcile the index with the target directory.
+
+        Lists the directory once and stats each SKILL.md; only skills that
+        were added, removed or whose SKILL.md changed are re-read. Returns the
+        number of entries that changed.
+        """
+        installed = set()
+        if self.target_dir.is_dir():
+            with os.scandir(self.target_dir) as it:
+                installed = {entry.name for entry in it if not entry.name.startswith('.') and entry.is_dir()}
+
+        changed = 0
+        for dir_name in sorted(set(self.skills) | installed):
+            entry = self.skills.get(dir_name)
+            if dir_name in installed and entry and entry['skill_md'] == skill_md_signature(self.target_dir / dir_name):
+                continue
+            before = self.skills.get(dir_name)
+            if self.update(dir_name) is not before:
+                changed += 1
+        return changed
+
+    def query(self, term: Optional[str] = None) -> List[dict]:
+        """Installed skills whose directory, name or description contains term."""
+        results = []
+        needle = term.lower() if term else None
+        for dir_name, entry in sorted(self.skills.items()):
+            haystack = f"{dir_name}\n{entry['name']}\n{entry['description']}".lower()
+            if needle is None or needle in haystack:
+                results.append({'dir': dir_name, **entry})
+        return results
@@ -0,0 +1,207 @@
+"""
+BM25 routing index over installed skills.
+
+Selects the skills most relevant to a prompt from their SKILL.md name and
+description, so a session can load a handful of skills instead of every
+installed one. The inverted index is persisted as .skill-router.json next to
+the installed skills and is updated incrementally from the installed-skill
+index (see skill_index.py): only skills whose name or description changed
+are re-tokenized.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROUTER_NAME = '.skill-router.json'
+ROUTER_VERSION = 1
+
+# Standard BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Name tokens count this many times, since a name match is a strong signal
+NAME_WEIGHT = 3
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do for from has have how i if in into is it its me my of on or
+our should so that the their them then there these this to use used uses using want was we
+when which while will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with plural 's' stripped."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def document_terms(name: str, description: str) -> Dict[str, int]:
+    """Term frequencies of a skill's routing document."""
+    terms: Dict[str, int] = {}
+    for token in tokenize(name.replace('-', ' ')) * NAME_WEIGHT + tokenize(description):
+        terms[token] = terms.get(token, 0) + 1
+    return terms
+
+
+def text_hash(name: str, description: str) -> str:
+    return hashlib.sha1(f"{name}\n{description}".encode('utf-8')).hexdigest()
+
+
+class SkillRouter:
+    """Inverted index with BM25 scoring over installed skills."""
+
+    def __init__(self, target_dir: Path):
+        self.target_dir = target_dir
+        self.path = target_dir / ROUTER_NAME
+        # Skill directory -> {'hash', 'length', 'terms'}
+        self.docs: Dict[str, dict] = {}
+        # Term -> {skill directory: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+        self.dirty = False
+        # Term -> (BM25 tf weight per skill, largest weight), built on first query
+        self._impacts: Dict[str, Tuple[Dict[str, float], float]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != ROUTER_VERSION:
+            return
+        self.docs = data['docs']
+        self.postings = data['postings']
+        self.total_length = sum(doc['length'] for doc in self.docs.values())
+
+    def save(self):
+        """Atomically write the router index if it changed."""
+        if not self.dirty:
+            return
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{ROUTER_NAME}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ROUTER_VERSION, 'docs': self.docs, 'postings': self.postings},
+                      f, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def add(self, dir_name: str, name: str, description: str):
+        """Index (or re-index) one skill."""
+        digest = text_hash(name, description)
+        doc = self.docs.get(dir_name)
+        if doc and doc['hash'] == digest:
+            return
+        self.remove(dir_name)
+
+        terms = document_terms(name, description)
+        length = sum(terms.values())
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[dir_name] = tf
+        self.docs[dir_name] = {'hash': digest, 'length': length, 'terms': sorted(terms)}
+        self.total_length += length
+        self.dirty = True
+        self._impacts.clear()
+
+    def remove(self, dir_name: str):
+        doc = self.docs.pop(dir_name, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(dir_name, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= doc['length']
+        self.dirty = True
+        self._impacts.clear()
+
+    def sync(self, skills: Dict[str, dict]) -> int:
+        """Bring the index in line with installed-skill index entries.
+
+        skills maps skill directory to an entry with 'name' and 'description'
+        (SkillIndex.skills). Returns the number of skills added, changed or
+        removed.
+        """
+        changed = 0
+        for dir_name in [d for d in self.docs if d not in skills]:
+            self.remove(dir_name)
+            changed += 1
+        for dir_name, entry in skills.items():
+            before = self.docs.get(dir_name)
+            self.add(dir_name, entry['name'], entry['description'])
+            if self.docs[dir_name] is not before:
+                changed += 1
+        return changed
+
+    def _term_impacts(self, term: str) -> Tuple[Dict[str, float], float]:
+        """Length-normalized BM25 tf weight of term in each skill, and the largest one.
+
+        Cached until the index changes, since the weights depend on the
+        average document length.
+        """
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            avg_length = self.total_length / len(self.docs)
+            weights = {}
+            for dir_name, tf in self.postings[term].items():
+                norm = K1 * (1 - B + B * self.docs[dir_name]['length'] / avg_length)
+                weights[dir_name] = tf * (K1 + 1) / (tf + norm)
+            impacts = self._impacts[term] = (weights, max(weights.values()))
+        return impacts
+
+    def query(self, prompt: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to k (skill directory, score) pairs, best first.
+
+        Skills that share no term with the prompt are not returned. Terms
+        are scored rarest first; once no skill outside the current candidates
+        could still reach the top k, the remaining (common, long) postings are
+        only probed for those candidates instead of scanned in full.
+        """
+        if k <= 0:
+            return []
+        n = len(self.docs)
+        terms = []
+        for term in set(tokenize(prompt)):
+            if term in self.postings:
+                df = len(self.postings[term])
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                weights, max_weight = self._term_impacts(term)
+                terms.append((idf * max_weight, idf, weights))
+        terms.sort(key=lambda t: t[0], reverse=True)
+
+        scores: Dict[str, float] = {}
+        remaining = sum(upper_bound for upper_bound, _, _ in terms)
+        for i, (upper_bound, idf, weights) in enumerate(terms):
+            if len(scores) >= k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                if remaining < threshold:
+                    # Skills not yet scored cannot make the top k any more
+                    candidates = {d: score for d, score in scores.items() if score + remaining >= threshold}
+                    for _, rest_idf, rest_weights in terms[i:]:
+                        for dir_name in candidates:
+                            weight = rest_weights.get(dir_name)
+                            if weight:
+                                candidates[dir_name] += rest_idf * weight
+                    scores = candidates
+                    break
+            for dir_name, weight in weights.items():
+                scores[dir_name] = scores.get(dir_name, 0.0) + idf * weight
+            remaining -= upper_bound
+        return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,282 @@
+"""
+Content-addressed skill store.
+
+Each distinct version of a skill is kept once under the store directory
+(default ~/.claude/skill-store) and import targets symlink into it, so disk
+use and import time grow with the number of distinct skill versions rather
+than with the number of projects a skill is imported into.
+
+Layout:
+    versions/<name>-<digest>/   immutable skill trees, named by content hash
+    refs.json                   link path -> current version, history and the
+                                versions rolled back from, plus a digest
+                                cache keyed by source directory
+
+Switching a target to another version replaces its symlink atomically, and
+the previous versions are remembered so a target can be rolled back.
+Versions rolled back from stay stored, so importing them again only relinks.
+Versions no target refers to any more are removed by gc().
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from atomic_replace import discard_tree, remove_tree, replace_path
+
+DEFAULT_STORE_DIR = Path.home() / '.claude' / 'skill-store'
+REFS_NAME = 'refs.json'
+
+# Hex digits of the tree digest used in version directory names
+DIGEST_LENGTH = 16
+
+# Temporary version directories older than this are assumed abandoned
+STALE_TEMP_SECONDS = 3600
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def walk_files(root: Path) -> List[Tuple[str, Path]]:
+    """List (relative POSIX path, path) for every file under root in a stable order."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            files.append((path.relative_to(root).as_posix(), path))
+    return files
+
+
+def tree_fingerprint(files: List[Tuple[str, Path]]) -> str:
+    """Cheap fingerprint of a tree from file paths, sizes and mtimes only."""
+    digest = hashlib.sha256()
+    for rel_path, path in files:
+        st = path.stat()
+        digest.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\0{st.st_mode & 0o111}\n".encode())
+    return digest.hexdigest()
+
+
+def tree_digest(files: List[Tuple[str, Path]]) -> str:
+    """Content digest of a tree from file paths, contents and executable bits."""
+    digest = hashlib.sha256()
+    for rel_path, path in files:
+        executable = 'x' if path.stat().st_mode & 0o111 else '-'
+        digest.update(f"{rel_path}\0{executable}\0{file_sha256(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def tree_size(root: Path) -> int:
+    """Total size in bytes of the files under root."""
+    return sum(path.stat().st_size for _, path in walk_files(root))
+
+
+class SkillStore:
+    """A directory of immutable skill versions that import targets link into.
+
+    Safe to share between threads of one process. Separate processes may
+    add versions concurrently, but the last one to write refs.json wins.
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_DIR):
+        self.root = root.expanduser().absolute()
+        self.versions_dir = self.root / 'versions'
+        self.refs_path = self.root / REFS_NAME
+        self._lock = threading.Lock()
+        self._refs = self._load_refs()
+
+    def _load_refs(self) -> dict:
+        try:
+            with open(self.refs_path, 'r', encoding='utf-8') as f:
+                refs = json.load(f)
+        except (OSError, ValueError):
+            refs = {}
+        refs.setdefault('links', {})
+        refs.setdefault('digests', {})
+        return refs
+
+    def _save_refs(self):
+        """Atomically write refs.json; the caller holds the lock."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.refs_path.with_name(f".{REFS_NAME}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, **self._refs}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.refs_path)
+
+    def digest(self, skill_dir: Path) -> str:
+        """Content digest of a skill directory.
+
+        Files are only re-hashed when a path, size or mtime changed since the
+        directory was last added.
+        """
+        files = walk_files(skill_dir)
+        fingerprint = tree_fingerprint(files)
+        key = str(skill_dir.resolve())
+        with self._lock:
+            cached = self._refs['digests'].get(key)
+        if cached and cached['fingerprint'] == fingerprint:
+            return cached['digest']
+
+        digest = tree_digest(files)
+        with self._lock:
+            self._refs['digests'][key] = {'fingerprint': fingerprint, 'digest': digest}
+            self._save_refs()
+        return digest
+
+    def version_path(self, version: str) -> Path:
+        return self.versions_dir / version
+
+    def versions(self) -> List[str]:
+        """Names of all stored versions."""
+        if not self.versions_dir.is_dir():
+            return []
+        return sorted(p.name for p in self.versions_dir.iterdir() if not p.name.startswith('.'))
+
+    def add(self, skill_dir: Path, copy_function: Callable = shutil.copy2) -> Tuple[str, bool]:
+        """Store a skill directory unless identical content is already stored.
+
+        Returns (version, created). The version is copied into a temporary
+        directory and renamed into place, so a stored version is always
+        complete.
+        """
+        version = f"{skill_dir.name}-{self.digest(skill_dir)[:DIGEST_LENGTH]}"
+        version_path = self.version_path(version)
+        if version_path.is_dir():
+            return version, False
+
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.versions_dir / f".{version}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copytree(skill_dir, temp_path, copy_function=copy_function)
+            try:
+                temp_path.rename(version_path)
+            except OSError:
+                # Another importer stored the same content first
+                if not version_path.is_dir():
+                    raise
+                shutil.rmtree(temp_path)
+                return version, False
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+        return version, True
+
+    def linked_version(self, link_path: Path) -> Optional[str]:
+        """The stored version link_path points at, or None if it is not a store link."""
+        if not link_path.is_symlink():
+            return None
+        destination = Path(os.readlink(link_path))
+        if destination.parent != self.versions_dir:
+            return None
+        return destination.name
+
+    def _switch(self, link_path: Path, version: str):
+        """Atomically point link_path at a stored version, replacing whatever is there."""
+        temp_link = link_path.with_name(f".{link_path.name}.link.tmp")
+        if temp_link.is_symlink() or temp_link.exists():
+            remove_tree(temp_link)
+        temp_link.symlink_to(self.version_path(version))
+        discard_tree(replace_path(temp_link, link_path))
+
+    def link(self, version: str, link_path: Path) -> Optional[str]:
+        """Point link_path at a stored version, remembering the one it replaces.
+
+        A real directory at link_path is swapped out and deleted in the
+        background. Returns the previous version.
+        """
+        previous = self.linked_version(link_path)
+        self._switch(link_path, version)
+
+        with self._lock:
+            entry = self._refs['links'].setdefault(str(link_path.absolute()), {'current': None, 'history': []})
+            if entry['current'] and entry['current'] != version:
+                entry['history'] = [v for v in entry['history'] if v != entry['current']] + [entry['current']]
+            entry['history'] = [v for v in entry['history'] if v != version]
+            entry['current'] = version
+            # A new link starts a new line of versions
+            entry['rolled_back'] = []
+            self._save_refs()
+        return previous
+
+    def history(self, link_path: Path) -> List[str]:
+        """Versions link_path pointed at before, oldest first."""
+        with self._lock:
+            entry = self._refs['links'].get(str(link_path.absolute()))
+            return list(entry['history']) if entry else []
+
+    def rollback(self, link_path: Path) -> Optional[str]:
+        """Switch link_path back to the version it pointed at before.
+
+        Each call steps one version further back. The version switched
+        away from is remembered as rolled back, so gc keeps it. Returns the
+        restored version, or None when there is nothing to roll back to.
+        """
+        with self._lock:
+            entry = self._refs['links'].get(str(link_path.absolute()))
+            history = entry['history'] if entry else []
+            while history and not self.version_path(history[-1]).is_dir():
+                history.pop()
+            if not history:
+                return None
+            version = history.pop()
+            self._switch(link_path, version)
+            entry.setdefault('rolled_back', []).append(entry['current'])
+            entry['current'] = version
+            self._save_refs()
+        return version
+
+    def gc(self, keep: int = 1, dry_run: bool = False) -> List[Tuple[str, int]]:
+        """Delete stored versions no target refers to.
+
+        A version is kept while it is the current version of a link that still
+        points into the store, one of that link's last keep versions in its
+        history, or one it was rolled back from. Links that were removed or replaced outside the store are
+        forgotten. Returns (version, bytes) for each version removed.
+        """
+        with self._lock:
+            live = {}
+            for link, entry in self._refs['links'].items():
+                if self.linked_version(Path(link)) == entry['current']:
+                    live[link] = entry
+
+            referenced = set()
+            for entry in live.values():
+                referenced.add(entry['current'])
+                referenced.update(entry.get('rolled_back', []))
+                if keep > 0:
+                    referenced.update(entry['history'][-keep:])
+
+            removed = []
+            for version in self.versions():
+                if version in referenced:
+                    continue
+                version_path = self.version_path(version)
+                removed.append((version, tree_size(version_path)))
+                if not dry_run:
+                    shutil.rmtree(version_path)
+
+            if not dry_run:
+                # Leftovers from interrupted adds; recent ones may still be in progress
+                if self.versions_dir.is_dir():
+                    cutoff = time.time() - STALE_TEMP_SECONDS
+                    for temp_path in self.versions_dir.glob('.*.tmp'):
+                        if temp_path.stat().st_mtime < cutoff:
+                            shutil.rmtree(temp_path, ignore_errors=True)
+                self._refs['links'] = live
+                self._refs['digests'] = {
+                    source: cached for source, cached in self._refs['digests'].items()
+                    if Path(source).is_dir()
+                }
+                self._save_refs()
+        return removed
@@ -0,0 +1,258 @@
+"""
+Watch skill directories and re-sync them as they change.
+
+Uses inotify through ctypes on Linux and falls back to polling file stats
+elsewhere. Bursts of events are debounced per skill, so saving many files at
+once triggers a single sync.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# inotify flags from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+EVENT_HEADER = struct.Struct('iIII')
+
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Swap, backup and lock files editors write while a file is open
+EDITOR_TEMP_SUFFIXES = ('.swp', '.swo', '.swx', '~')
+
+
+def is_editor_temp(name: str) -> bool:
+    """Whether a file name is editor scratch that should not trigger a sync."""
+    return name.endswith(EDITOR_TEMP_SUFFIXES) or name.startswith('.#') or (
+        len(name) > 1 and name.startswith('#') and name.endswith('#'))
+
+
+def _load_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """Reports which skills changed, using one inotify watch per directory."""
+
+    def __init__(self, skill_dirs: List[Path], libc):
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.skill_dirs = list(skill_dirs)
+        # Watch descriptor -> (skill directory, watched directory)
+        self._watches: Dict[int, Tuple[Path, Path]] = {}
+        for skill_dir in self.skill_dirs:
+            self._watch_tree(skill_dir, Path(skill_dir))
+
+    def _watch_tree(self, skill_dir: Path, directory: Path):
+        """Watch directory and everything below it (inotify is not recursive)."""
+        for dirpath, dirnames, _ in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"Cannot watch {dirpath}: {os.strerror(errno)}")
+            self._watches[wd] = (skill_dir, Path(dirpath))
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Block up to timeout seconds (forever if None); return skills with changes."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + name_len].rstrip(b'\0')
+                offset += EVENT_HEADER.size + name_len
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; resync everything
+                    changed.update(self.skill_dirs)
+                    continue
+                watch = self._watches.get(wd)
+                if watch is None:
+                    continue
+                skill_dir, directory = watch
+                if mask & IN_IGNORED:
+                    del self._watches[wd]
+                    continue
+                if name and not mask & IN_ISDIR and is_editor_temp(os.fsdecode(name)):
+                    continue
+                changed.add(skill_dir)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    new_dir = directory / os.fsdecode(name)
+                    if new_dir.is_dir():
+                        self._watch_tree(skill_dir, new_dir)
+        return changed
+
+    def rewatch(self, skill_dir: Path):
+        """Watch a skill again after its directory was removed and recreated."""
+        self._watch_tree(skill_dir, Path(skill_dir))
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Reports which skills changed by comparing file stats between polls."""
+
+    def __init__(self, skill_dirs: List[Path], interval: float = DEFAULT_POLL_INTERVAL):
+        self.skill_dirs = list(skill_dirs)
+        self.interval = interval
+        self._signatures = {skill_dir: self._signature(skill_dir) for skill_dir in self.skill_dirs}
+
+    @staticmethod
+    def _signature(skill_dir: Path) -> frozenset:
+        entries = set()
+        for dirpath, _, filenames in os.walk(skill_dir):
+            for filename in filenames:
+                if is_editor_temp(filename):
+                    continue
+                try:
+                    st = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                entries.add((dirpath, filename, st.st_size, st.st_mtime_ns, st.st_mode))
+        return frozenset(entries)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        changed = set()
+        for skill_dir in self.skill_dirs:
+            signature = self._signature(skill_dir)
+            if signature != self._signatures[skill_dir]:
+                self._signatures[skill_dir] = signature
+                changed.add(skill_dir)
+        return changed
+
+    def rewatch(self, skill_dir: Path):
+        # The next poll compares against the recreated tree anyway
+        pass
+
+    def close(self):
+        pass
+
+
+def create_watcher(skill_dirs: List[Path], poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """Return an inotify watcher when the platform supports it, else a polling one."""
+    libc = _load_libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(skill_dirs, libc)
+        except OSError as e:
+            print(f"Warning: inotify unavailable ({e}), polling every {poll_interval}s")
+    return PollingWatcher(skill_dirs, poll_interval)
+
+
+def watch_skills(
+    skill_dirs: List[Path],
+    sync: Callable[[Path], Tuple[bool, str, dict]],
+    debounce: float = DEFAULT_DEBOUNCE,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> List[float]:
+    """Call sync(skill_dir) whenever a skill changes, until interrupted.
+
+    A skill is synced once no new event for it has arrived for debounce
+    seconds. A skill whose SKILL.md is missing (deleted, mid-checkout or
+    swapped by an editor) is not synced; it is checked every poll_interval
+    and synced once it is back. Editor swap files never trigger a sync, and
+    an exception from sync is reported without stopping the watch. Prints
+    each sync with its latency from the first change in the burst to the
+    files being in place. Returns the latencies in seconds.
+    """
+    watcher = create_watcher(skill_dirs, poll_interval)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"Watching {len(skill_dirs)} skill(s) with {mode} (debounce {debounce * 1000:.0f}ms). Press Ctrl+C to stop.")
+
+    # Skill -> (first event, last event) of the burst not yet synced
+    pending: Dict[Path, Tuple[float, float]] = {}
+    # Skills without a SKILL.md -> time of the first change seen while missing
+    missing: Dict[Path, float] = {}
+    latencies = []
+    try:
+        while True:
+            timeout = poll_interval if missing else None
+            if pending:
+                wait = max(0.0, min(last for _, last in pending.values()) + debounce - time.monotonic())
+                timeout = wait if timeout is None else min(timeout, wait)
+
+            for skill_dir in watcher.wait(timeout):
+                now = time.monotonic()
+                first = pending[skill_dir][0] if skill_dir in pending else now
+                pending[skill_dir] = (first, now)
+
+            now = time.monotonic()
+            for skill_dir, first in list(missing.items()):
+                if (skill_dir / 'SKILL.md').is_file():
+                    try:
+                        watcher.rewatch(skill_dir)
+                    except OSError:
+                        # Gone again before it could be watched; check on the next poll
+                        continue
+                    del missing[skill_dir]
+                    pending[skill_dir] = (first, now - debounce)
+
+            for skill_dir, (first, last) in sorted(pending.items()):
+                if now - last < debounce:
+                    continue
+                del pending[skill_dir]
+                if not (skill_dir / 'SKILL.md').is_file():
+                    if skill_dir not in missing:
+                        missing[skill_dir] = first
+                        print(f"Waiting for {skill_dir.name}: SKILL.md is missing, not syncing")
+                    continue
+                sync_start = time.monotonic()
+                try:
+                    success, message, _ = sync(skill_dir)
+                except Exception as e:
+                    success, message = False, f"Error syncing {skill_dir.name}: {e}"
+                done = time.monotonic()
+                if not success and "Skipped" in message:
+                    continue
+                if success:
+                    latencies.append(done - first)
+                print(f"{message} [sync {(done - sync_start) * 1000:.1f}ms, "
+                      f"{(done - first) * 1000:.1f}ms after first change]")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return latencies
@@ -0,0 +1,215 @@
+"""MCP Tool Definition Footprint Analyzer
+
+The tool list returned by list_tools is sent to the model on every turn, so
+verbose descriptions and deeply nested input schemas add latency and cost to
+each request. This script estimates tokens per tool definition, ranks the
+heaviest ones and can write a compacted variant with redundant schema fields
+stripped, which evaluation.py can then run against via --tools-file.
+"""
+
+import argparse
+import asyncio
+import copy
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from budget import estimate_tokens
+from connections import create_connection
+
+# Schema keys that carry no information the model needs to call a tool
+REDUNDANT_SCHEMA_KEYS = {"title", "$schema", "$id", "$comment"}
+
+
+def schema_depth(schema: Any) -> int:
+    """Maximum nesting depth of dicts/lists in a JSON schema."""
+    if isinstance(schema, dict):
+        return 1 + max((schema_depth(v) for v in schema.values()), default=0)
+    if isinstance(schema, list):
+        return max((schema_depth(v) for v in schema), default=0)
+    return 0
+
+
+def tool_footprint(tool: dict[str, Any]) -> dict[str, Any]:
+    """Estimate the token cost of one tool definition and its parts."""
+    schema = tool.get("input_schema") or {}
+    return {
+        "name": tool["name"],
+        "total_tokens": estimate_tokens(json_codec.dumps(tool)),
+        "description_tokens": estimate_tokens(tool.get("description") or ""),
+        "schema_tokens": estimate_tokens(json_codec.dumps(schema)),
+        "schema_depth": schema_depth(schema),
+        "properties": len(schema.get("properties", {})),
+    }
+
+
+def _collapse_whitespace(text: str) -> str:
+    return re.sub(r"[ \t]+", " ", re.sub(r"\n\s*\n+", "\n", text)).strip()
+
+
+def compact_schema(schema: Any) -> Any:
+    """Return a copy of a JSON schema with redundant fields removed.
+
+    Drops titles and meta keys, null defaults, and collapses the
+    anyOf [X, null] pattern generated for optional parameters into X.
+    """
+    if isinstance(schema, list):
+        return [compact_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    compacted = {}
+    for key, value in schema.items():
+        if key in REDUNDANT_SCHEMA_KEYS and not isinstance(value, dict):
+            continue
+        if key == "default" and value is None:
+            continue
+        if key == "description" and isinstance(value, str):
+            value = _collapse_whitespace(value)
+        elif key == "properties" and isinstance(value, dict):
+            # Property names are user data here, never strip them as keywords
+            value = {name: compact_schema(prop) for name, prop in value.items()}
+        else:
+            value = compact_schema(value)
+        compacted[key] = value
+
+    any_of = compacted.get("anyOf")
+    if isinstance(any_of, list) and len(any_of) == 2 and {"type": "null"} in any_of:
+        # Both options may be null; then there is nothing to collapse into
+        non_null = next((option for option in any_of if option != {"type": "null"}), None)
+        if non_null is not None:
+            del compacted["anyOf"]
+            compacted = {**non_null, **compacted}
+
+    return compacted
+
+
+def compact_tool(tool: dict[str, Any], max_description_chars: int | None = None) -> dict[str, Any]:
+    """Return a compacted copy of a tool definition."""
+    compacted = copy.deepcopy(tool)
+    description = _collapse_whitespace(compacted.get("description") or "")
+    if max_description_chars and len(description) > max_description_chars:
+        first_paragraph = description.split("\n", 1)[0]
+        description = first_paragraph if len(first_paragraph) <= max_description_chars else description[:max_description_chars].rstrip() + "…"
+    compacted["description"] = description
+    compacted["input_schema"] = compact_schema(compacted.get("input_schema") or {"type": "object"})
+    return compacted
+
+
+def format_report(tools: list[dict[str, Any]], compacted: list[dict[str, Any]] | None, top: int) -> str:
+    """Render the ranked footprint table and totals as Markdown."""
+    footprints = sorted((tool_footprint(t) for t in tools), key=lambda f: f["total_tokens"], reverse=True)
+    compact_by_name = {t["name"]: tool_footprint(t)["total_tokens"] for t in compacted or []}
+    total = sum(f["total_tokens"] for f in footprints)
+
+    lines = [
+        "# Tool Definition Footprint",
+        "",
+        f"- **Tools**: {len(footprints)}",
+        f"- **Estimated tokens per turn**: {total:,}",
+    ]
+    if compacted:
+        compact_total = sum(compact_by_name.values())
+        saved = total - compact_total
+        lines.append(f"- **Compacted**: {compact_total:,} ({saved:,} saved, {saved / total * 100 if total else 0:.1f}%)")
+
+    lines += [
+        "",
+        "| Rank | Tool | Tokens | Share | Description | Schema | Depth | Params |" + (" Compacted |" if compacted else ""),
+        "|---|---|---|---|---|---|---|---|" + ("---|" if compacted else ""),
+    ]
+    for rank, f in enumerate(footprints[:top], 1):
+        row = (
+            f"| {rank} | {f['name']} | {f['total_tokens']:,} | {f['total_tokens'] / total * 100 if total else 0:.1f}% "
+            f"| {f['description_tokens']:,} | {f['schema_tokens']:,} | {f['schema_depth']} | {f['properties']} |"
+        )
+        if compacted:
+            row += f" {compact_by_name.get(f['name'], 0):,} |"
+        lines.append(row)
+
+    return "\n".join(lines) + "\n"
+
+
+async def fetch_tools(args) -> list[dict[str, Any]]:
+    """List tools from the MCP server described by the CLI arguments."""
+    from evaluation import parse_env_vars, parse_headers
+
+    connection = create_connection(
+        transport=args.transport,
+        command=args.command,
+        args=args.args,
+        env=parse_env_vars(args.env) if args.env else None,
+        url=args.url,
+        headers=parse_headers(args.headers) if args.headers else None,
+    )
+    async with connection:
+        return await connection.list_tools()
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Measure and compact the tool definitions an MCP server sends to the model",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Rank the heaviest tools of a local stdio server
+  python analyze_tools.py -t stdio -c python -a my_server.py
+
+  # Write a compacted variant and evaluate against it
+  python analyze_tools.py -t stdio -c python -a my_server.py --compact-output compact_tools.json
+  python evaluation.py -t stdio -c python -a my_server.py --tools-file compact_tools.json eval.xml
+
+  # Analyze a saved tool list without connecting
+  python analyze_tools.py --from-file tools.json
+        """,
+    )
+    parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
+    parser.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
+    parser.add_argument("-a", "--args", nargs="+", help="Arguments for the command (stdio only)")
+    parser.add_argument("-e", "--env", nargs="+", help="Environment variables in KEY=VALUE format (stdio only)")
+    parser.add_argument("-u", "--url", help="MCP server URL (sse/http only)")
+    parser.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
+    parser.add_argument("--from-file", type=Path, help="Read tool definitions from a JSON file instead of a server")
+    parser.add_argument("--save-tools", type=Path, help="Save the server's tool definitions as JSON")
+    parser.add_argument("--compact-output", type=Path, help="Write a compacted tool list as JSON")
+    parser.add_argument("--max-description-chars", type=int, help="When compacting, shorten tool descriptions to their first paragraph or this many characters")
+    parser.add_argument("--top", type=int, default=20, help="Number of tools to rank (default: 20)")
+    parser.add_argument("-o", "--output", type=Path, help="Output file for the report (default: stdout)")
+
+    args = parser.parse_args()
+
+    if args.from_file:
+        try:
+            tools = json_codec.loads(args.from_file.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read tools from {args.from_file}: {e}")
+            sys.exit(1)
+    else:
+        try:
+            tools = await fetch_tools(args)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    if args.save_tools:
+        args.save_tools.write_text(json_codec.dumps(tools, indent=True), encoding="utf-8")
+        print(f"✅ Tool definitions saved to {args.save_tools}")
+
+    compacted = None
+    if args.compact_output:
+        compacted = [compact_tool(t, args.max_description_chars) for t in tools]
+        args.compact_output.write_text(json_codec.dumps(compacted, indent=True), encoding="utf-8")
+        print(f"✅ Compacted tool definitions saved to {args.compact_output}")
+
+    report = format_report(tools, compacted, args.top)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+        print(f"✅ Report saved to {args.output}")
+    else:
+        print("\n" + report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
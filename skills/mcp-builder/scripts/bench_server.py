@@ -0,0 +1,41 @@
+"""Minimal MCP server used by the transport benchmark.
+
+Exposes the same tools over stdio, SSE or Streamable HTTP so that transports
+can be compared against identical server-side work.
+"""
+
+import argparse
+
+from mcp.server.fastmcp import FastMCP
+
+
+def build_server(host: str, port: int) -> FastMCP:
+    """Create the benchmark server with its tools registered."""
+    mcp = FastMCP("transport-bench", host=host, port=port, log_level="WARNING")
+
+    @mcp.tool()
+    def echo(data: str) -> str:
+        """Return the given payload unchanged."""
+        return data
+
+    @mcp.tool()
+    def generate(size: int) -> str:
+        """Return a payload of the requested size in bytes."""
+        return "x" * size
+
+    return mcp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server for transport benchmarks")
+    parser.add_argument("--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport to serve (default: stdio)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address for sse/http (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for sse/http (default: 8765)")
+    args = parser.parse_args()
+
+    mcp = build_server(args.host, args.port)
+    mcp.run(transport="streamable-http" if args.transport == "http" else args.transport)
+
+
+if __name__ == "__main__":
+    main()
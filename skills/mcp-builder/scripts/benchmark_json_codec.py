@@ -0,0 +1,85 @@
+"""JSON Codec Micro-benchmark
+
+Times every available json_codec backend on payloads shaped like the ones the
+evaluation harness serializes: tool results of increasing size and per-task
+tool metrics rendered with indentation for the report.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import json_codec
+
+
+def tool_result_payload(size: int) -> list[dict[str, Any]]:
+    """A tool result of roughly size bytes, split into text content blocks."""
+    block = {"type": "text", "text": "r" * 1024}
+    rows = [{"id": i, "name": f"item-{i}", "score": i * 0.5, "tags": ["a", "b", "c"]} for i in range(max(size // 2048, 1))]
+    return [block] * max(size // 2048, 1) + [{"type": "json", "rows": rows}]
+
+
+def tool_metrics_payload(tools: int = 20, calls: int = 50) -> dict[str, Any]:
+    """Per-task tool metrics as produced by agent_loop."""
+    return {
+        f"tool_{t}": {"count": calls, "durations": [0.123456 * (i + 1) for i in range(calls)]}
+        for t in range(tools)
+    }
+
+
+def time_call(fn, number: int) -> float:
+    """Best-of-3 mean seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the available JSON codecs")
+    parser.add_argument("-s", "--sizes", nargs="+", type=int, default=[1024, 65536, 1048576, 4194304], help="Tool result sizes in bytes (default: 1KB 64KB 1MB 4MB)")
+    parser.add_argument("-o", "--output", type=Path, help="Output JSON file for results")
+    args = parser.parse_args()
+
+    cases = [(f"tool_result {size}B", tool_result_payload(size), False) for size in args.sizes]
+    cases.append(("report tool_metrics (indent)", tool_metrics_payload(), True))
+
+    results = []
+    print(f"Available codecs: {', '.join(json_codec.CODECS)}")
+    if "orjson" not in json_codec.CODECS:
+        print("Note: install orjson to benchmark the fast path (pip install orjson)")
+
+    for label, payload, indent in cases:
+        encoded_size = len(json_codec.get_codec("stdlib").dumps(payload, indent))
+        number = max(3, min(2000, 20_000_000 // max(encoded_size, 1)))
+        timings = {}
+        for name in json_codec.CODECS:
+            codec = json_codec.get_codec(name)
+            encoded = codec.dumps(payload, indent)
+            timings[name] = {
+                "dumps_s": time_call(lambda: codec.dumps(payload, indent), number),
+                "loads_s": time_call(lambda: codec.loads(encoded), number),
+            }
+        baseline = timings["stdlib"]["dumps_s"]
+        for name, timing in timings.items():
+            speedup = baseline / timing["dumps_s"] if timing["dumps_s"] else 0.0
+            results.append({"case": label, "bytes": encoded_size, "codec": name, **timing, "dumps_speedup": speedup})
+            print(
+                f"{label:<32} {name:<7} dumps {timing['dumps_s'] * 1e6:>10.1f}µs "
+                f"loads {timing['loads_s'] * 1e6:>10.1f}µs  x{speedup:.1f}"
+            )
+
+    if args.output:
+        args.output.write_text(json_codec.dumps({"results": results}, indent=True), encoding="utf-8")
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
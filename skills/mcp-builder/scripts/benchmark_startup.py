@@ -0,0 +1,98 @@
+"""Startup Time Benchmark
+
+Measures how long the evaluation scripts take to start for the short-lived
+invocations CI runs most often (--help, --dry-run, importing connections),
+and what eagerly importing anthropic and mcp would add on top. Each case is
+run in a fresh interpreter.
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import json_codec
+from stats import percentile
+
+SCRIPTS_DIR = Path(__file__).parent
+EXAMPLE_EVAL = SCRIPTS_DIR / "example_evaluation.xml"
+
+
+def startup_cases() -> list[tuple[str, list[str]]]:
+    """The commands to time, as (label, argv) pairs."""
+    cases = [
+        ("python (empty)", [sys.executable, "-c", "pass"]),
+        ("import connections", [sys.executable, "-c", "import connections"]),
+        ("evaluation.py --help", [sys.executable, "evaluation.py", "--help"]),
+        ("evaluation.py --dry-run", [sys.executable, "evaluation.py", "-c", "python", "-a", "server.py", "--dry-run", str(EXAMPLE_EVAL)]),
+    ]
+    # What the eager imports used to cost, when the packages are installed
+    for module in ("anthropic", "mcp.client.stdio", "mcp.client.sse", "mcp.client.streamable_http"):
+        if importlib.util.find_spec(module.split(".")[0]) is not None:
+            cases.append((f"import {module}", [sys.executable, "-c", f"import {module}"]))
+    return cases
+
+
+def time_command(argv: list[str], runs: int) -> list[float]:
+    """Wall-clock seconds for each of runs fresh invocations."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def top_imports(argv: list[str], limit: int) -> list[tuple[str, float]]:
+    """The slowest top-level imports of a command, from -X importtime."""
+    proc = subprocess.run(
+        [argv[0], "-X", "importtime"] + argv[1:],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup time of the evaluation scripts")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="Fresh interpreter runs per case (default: 10)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list per case (default: 5)")
+    parser.add_argument("-o", "--output", type=Path, help="Output JSON file for results")
+    args = parser.parse_args()
+
+    results = []
+    for label, argv in startup_cases():
+        timings = time_command(argv, args.runs)
+        result = {
+            "case": label,
+            "runs": args.runs,
+            "min_ms": min(timings) * 1000,
+            "p50_ms": percentile(timings, 50) * 1000,
+            "max_ms": max(timings) * 1000,
+            "top_imports_ms": top_imports(argv, args.top),
+        }
+        results.append(result)
+
+        print(f"{label:<36} p50 {result['p50_ms']:>8.1f}ms  min {result['min_ms']:>8.1f}ms")
+        for name, cumulative_ms in result["top_imports_ms"]:
+            print(f"    {name:<32} {cumulative_ms:>8.1f}ms")
+
+    if args.output:
+        args.output.write_text(json_codec.dumps({"results": results}, indent=True), encoding="utf-8")
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""MCP Transport Benchmark
+
+Runs the same tools through the stdio, SSE and Streamable HTTP connections
+against a local benchmark server and reports connect time, per-call latency
+percentiles, throughput and CPU per call. Results are written as JSON so runs
+can be compared across versions.
+"""
+
+import argparse
+import asyncio
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from connections import MCPConnection, MCPConnectionHTTP, MCPConnectionSSE, MCPConnectionStdio
+from resource_monitor import CLOCK_TICKS, child_pids, process_tree, read_process_stats
+from stats import percentile
+
+BENCH_SERVER = Path(__file__).with_name("bench_server.py")
+
+
+def children_cpu_seconds() -> float | None:
+    """Sum user+system CPU time of this process's child process trees.
+
+    Returns None where /proc is unavailable.
+    """
+    if not Path("/proc/self/task").exists():
+        return None
+
+    ticks = 0
+    for child in child_pids():
+        for pid in process_tree(child):
+            stats = read_process_stats(pid)
+            if stats:
+                ticks += stats["cpu_ticks"]
+    return ticks / CLOCK_TICKS
+
+
+def wait_for_port(host: str, port: int, timeout: float = 15.0):
+    """Block until a TCP server accepts connections on host:port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server on {host}:{port} did not start within {timeout:.0f}s")
+
+
+def start_remote_server(transport: str, host: str, port: int) -> subprocess.Popen:
+    """Launch the benchmark server for an sse/http transport and wait for it."""
+    proc = subprocess.Popen(
+        [sys.executable, str(BENCH_SERVER), "--transport", transport, "--host", host, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(host, port)
+    except TimeoutError:
+        proc.kill()
+        raise
+    return proc
+
+
+def make_connection(transport: str, host: str, port: int) -> MCPConnection:
+    """Create a connection to the local benchmark server for a transport."""
+    if transport == "stdio":
+        return MCPConnectionStdio(command=sys.executable, args=[str(BENCH_SERVER), "--transport", "stdio"])
+    if transport == "sse":
+        return MCPConnectionSSE(url=f"http://{host}:{port}/sse")
+    return MCPConnectionHTTP(url=f"http://{host}:{port}/mcp")
+
+
+async def run_calls(
+    connection: MCPConnection,
+    tool: str,
+    payload_size: int,
+    concurrency: int,
+    calls: int,
+) -> list[float]:
+    """Issue calls tool invocations with at most concurrency in flight."""
+    arguments = {"data": "x" * payload_size} if tool == "echo" else {"size": payload_size}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_call():
+        async with semaphore:
+            start = time.perf_counter()
+            await connection.call_tool(tool, arguments)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    return latencies
+
+
+async def benchmark_transport(
+    transport: str,
+    tool: str,
+    payload_sizes: list[int],
+    concurrency_levels: list[int],
+    calls: int,
+    warmup: int,
+    host: str,
+    port: int,
+) -> list[dict[str, Any]]:
+    """Sweep payload sizes and concurrency levels over a single transport."""
+    server = start_remote_server(transport, host, port) if transport != "stdio" else None
+    results = []
+
+    try:
+        connection = make_connection(transport, host, port)
+        connect_start = time.perf_counter()
+        async with connection:
+            connect_s = time.perf_counter() - connect_start
+            print(f"🔗 {transport}: connected in {connect_s * 1000:.1f}ms")
+
+            for payload_size in payload_sizes:
+                for concurrency in concurrency_levels:
+                    if warmup:
+                        await run_calls(connection, tool, payload_size, concurrency, warmup)
+
+                    client_cpu_start = time.process_time()
+                    server_cpu_start = children_cpu_seconds()
+                    wall_start = time.perf_counter()
+                    latencies = await run_calls(connection, tool, payload_size, concurrency, calls)
+                    wall_s = time.perf_counter() - wall_start
+                    client_cpu_s = time.process_time() - client_cpu_start
+                    server_cpu_end = children_cpu_seconds()
+
+                    server_cpu_ms = None
+                    if server_cpu_start is not None and server_cpu_end is not None:
+                        server_cpu_ms = (server_cpu_end - server_cpu_start) * 1000 / calls
+
+                    result = {
+                        "transport": transport,
+                        "tool": tool,
+                        "payload_bytes": payload_size,
+                        "concurrency": concurrency,
+                        "calls": calls,
+                        "connect_s": connect_s,
+                        "wall_s": wall_s,
+                        "throughput_cps": calls / wall_s if wall_s else 0.0,
+                        "latency_ms": {
+                            "mean": sum(latencies) * 1000 / len(latencies),
+                            "p50": percentile(latencies, 50) * 1000,
+                            "p90": percentile(latencies, 90) * 1000,
+                            "p99": percentile(latencies, 99) * 1000,
+                            "max": max(latencies) * 1000,
+                        },
+                        "client_cpu_ms_per_call": client_cpu_s * 1000 / calls,
+                        "server_cpu_ms_per_call": server_cpu_ms,
+                    }
+                    results.append(result)
+                    print(
+                        f"   {payload_size:>9}B x{concurrency:<3} "
+                        f"p50={result['latency_ms']['p50']:.2f}ms "
+                        f"p99={result['latency_ms']['p99']:.2f}ms "
+                        f"{result['throughput_cps']:.0f} calls/s"
+                    )
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    return results
+
+
+def format_table(results: list[dict[str, Any]]) -> str:
+    """Render benchmark results as a Markdown table."""
+    lines = [
+        "| Transport | Payload (B) | Concurrency | Connect (ms) | p50 (ms) | p90 (ms) | p99 (ms) | Calls/s | Client CPU/call (ms) | Server CPU/call (ms) |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        server_cpu = f"{r['server_cpu_ms_per_call']:.3f}" if r["server_cpu_ms_per_call"] is not None else "N/A"
+        lines.append(
+            f"| {r['transport']} | {r['payload_bytes']} | {r['concurrency']} | {r['connect_s'] * 1000:.1f} "
+            f"| {r['latency_ms']['p50']:.2f} | {r['latency_ms']['p90']:.2f} | {r['latency_ms']['p99']:.2f} "
+            f"| {r['throughput_cps']:.0f} | {r['client_cpu_ms_per_call']:.3f} | {server_cpu} |"
+        )
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark MCP transports against a local server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare all transports with the default sweep
+  python benchmark_transports.py -o results.json
+
+  # Only stdio and http, large payloads, high concurrency
+  python benchmark_transports.py -t stdio http -p 65536 1048576 -n 1 32
+        """,
+    )
+    parser.add_argument("-t", "--transports", nargs="+", choices=["stdio", "sse", "http"], default=["stdio", "sse", "http"], help="Transports to benchmark (default: all)")
+    parser.add_argument("-p", "--payload-sizes", nargs="+", type=int, default=[64, 4096, 65536, 1048576], help="Payload sizes in bytes (default: 64 4096 65536 1048576)")
+    parser.add_argument("-n", "--concurrency", nargs="+", type=int, default=[1, 4, 16], help="Concurrent in-flight calls (default: 1 4 16)")
+    parser.add_argument("--calls", type=int, default=200, help="Measured calls per combination (default: 200)")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured warmup calls per combination (default: 10)")
+    parser.add_argument("--tool", choices=["echo", "generate"], default="echo", help="echo sends the payload both ways, generate only returns it (default: echo)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address for sse/http servers (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for sse/http servers (default: 8765)")
+    parser.add_argument("-o", "--output", type=Path, help="Output JSON file for results (default: stdout table only)")
+
+    args = parser.parse_args()
+
+    if args.calls < 1 or any(n < 1 for n in args.concurrency) or any(p < 0 for p in args.payload_sizes):
+        print("Error: --calls and --concurrency must be positive and payload sizes non-negative")
+        sys.exit(1)
+
+    print("🚀 Starting transport benchmark")
+
+    results = []
+    for transport in args.transports:
+        results.extend(await benchmark_transport(
+            transport,
+            args.tool,
+            args.payload_sizes,
+            args.concurrency,
+            args.calls,
+            args.warmup,
+            args.host,
+            args.port,
+        ))
+
+    print("\n" + format_table(results))
+
+    if args.output:
+        try:
+            from importlib.metadata import version
+            mcp_version = version("mcp")
+        except Exception:
+            mcp_version = None
+
+        document = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mcp_version": mcp_version,
+                "calls": args.calls,
+                "warmup": args.warmup,
+                "tool": args.tool,
+            },
+            "results": results,
+        }
+        args.output.write_text(json_codec.dumps(document, indent=True), encoding="utf-8")
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""Token and cost accounting for evaluation runs.
+
+Estimates what a run will cost before it starts, tracks live input/output
+token totals from API usage, and enforces optional token and cost caps so a
+runaway tool loop stops cleanly instead of silently burning budget.
+"""
+
+from typing import Any
+
+import json_codec
+
+# USD per million (input, output) tokens, matched by model name prefix
+MODEL_PRICING = {
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-opus": (15.0, 75.0),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+CHARS_PER_TOKEN = 4
+
+
+class BudgetExceeded(Exception):
+    """Raised when a run crosses its token or cost cap."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text (about four characters per token)."""
+    return max(len(text) // CHARS_PER_TOKEN, 1) if text else 0
+
+
+def model_pricing(model: str) -> tuple[float, float] | None:
+    """Look up (input, output) USD per million tokens for a model."""
+    for prefix, prices in MODEL_PRICING.items():
+        if model.startswith(prefix):
+            return prices
+    return None
+
+
+def usage_counts(usage: Any) -> dict[str, int]:
+    """Input (including prompt cache) and output tokens from an API usage object."""
+    return {
+        "input_tokens": (getattr(usage, "input_tokens", 0) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0),
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    }
+
+
+class TokenBudget:
+    """Tracks token usage and cost against optional caps."""
+
+    def __init__(
+        self,
+        model: str,
+        max_tokens: int | None = None,
+        max_cost: float | None = None,
+        input_price: float | None = None,
+        output_price: float | None = None,
+    ):
+        default_prices = model_pricing(model) or (None, None)
+        self.input_price = input_price if input_price is not None else default_prices[0]
+        self.output_price = output_price if output_price is not None else default_prices[1]
+        if max_cost is not None and (self.input_price is None or self.output_price is None):
+            raise ValueError(f"No pricing known for model {model}; pass --input-price and --output-price to use --max-cost")
+
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.stop_reason = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def cost(self, input_tokens: int | None = None, output_tokens: int | None = None) -> float | None:
+        """USD cost of the given token counts (default: the running totals)."""
+        if self.input_price is None or self.output_price is None:
+            return None
+        input_tokens = self.input_tokens if input_tokens is None else input_tokens
+        output_tokens = self.output_tokens if output_tokens is None else output_tokens
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+    def record(self, usage: Any) -> dict[str, int]:
+        """Add one API response's usage and return it as a dict."""
+        counts = usage_counts(usage)
+        self.input_tokens += counts["input_tokens"]
+        self.output_tokens += counts["output_tokens"]
+        return counts
+
+    def check(self):
+        """Raise BudgetExceeded once a cap has been reached."""
+        if self.max_tokens is not None and self.total_tokens >= self.max_tokens:
+            self.stop_reason = f"token cap reached ({self.total_tokens:,} ≥ {self.max_tokens:,})"
+        elif self.max_cost is not None and self.cost() >= self.max_cost:
+            self.stop_reason = f"cost cap reached (${self.cost():.2f} ≥ ${self.max_cost:.2f})"
+        if self.stop_reason:
+            raise BudgetExceeded(self.stop_reason)
+
+    def estimate(
+        self,
+        qa_pairs: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        system_prompt: str,
+        turns_per_task: int = 4,
+        output_tokens_per_turn: int = 400,
+        tool_result_tokens: int = 500,
+    ) -> dict[str, Any]:
+        """Estimate run cost from suite size, tool schemas and system prompt.
+
+        Every turn resends the system prompt and tool definitions; the
+        conversation then grows by each turn's output and tool result.
+        """
+        schema = estimate_tokens(json_codec.dumps(tools))
+        fixed = estimate_tokens(system_prompt) + schema
+        growth = output_tokens_per_turn + tool_result_tokens
+
+        input_tokens = 0
+        for qa_pair in qa_pairs:
+            question = estimate_tokens(qa_pair["question"])
+            input_tokens += sum(fixed + question + turn * growth for turn in range(turns_per_task))
+        output_tokens = len(qa_pairs) * turns_per_task * output_tokens_per_turn
+
+        return {
+            "fixed_tokens_per_turn": fixed,
+            "tool_schema_tokens": schema,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": self.cost(input_tokens, output_tokens),
+            "turns_per_task": turns_per_task,
+        }
+
+    def format_estimate(self, estimate: dict[str, Any]) -> str:
+        cost = f", ~${estimate['cost']:.2f}" if estimate["cost"] is not None else ""
+        return (
+            f"💰 Estimated usage: ~{estimate['input_tokens']:,} input / ~{estimate['output_tokens']:,} output tokens{cost} "
+            f"({estimate['fixed_tokens_per_turn']:,} tokens of system prompt and tool schemas per turn, "
+            f"{estimate['turns_per_task']} turns per task assumed)"
+        )
+
+    def format_progress(self) -> str:
+        cost = self.cost()
+        return f"💰 Tokens so far: {self.input_tokens:,} in / {self.output_tokens:,} out" + (f" (${cost:.4f})" if cost is not None else "")
+
+    def format_summary(self) -> str:
+        """Render totals, caps and stop reason as report summary lines."""
+        cost = self.cost()
+        lines = f"- **Total Tokens**: {self.input_tokens:,} input / {self.output_tokens:,} output\n"
+        if cost is not None:
+            lines += f"- **Estimated Cost**: ${cost:.4f}\n"
+        if self.stop_reason:
+            lines += f"- **Stopped Early**: {self.stop_reason}\n"
+        return lines
@@ -0,0 +1,265 @@
+"""MCP Evaluation Result Comparison
+
+Compares two evaluation result sets saved with `evaluation.py --results` and
+reports per-task and per-tool changes in accuracy, latency percentiles,
+tool-call counts and tokens. Each change is tested for significance so run to
+run noise is not flagged as a regression.
+
+A result set is one or more JSONL files; passing several runs per side gives
+the per-task tests more samples to work with.
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from stats import mcnemar_exact, mean, percentile, permutation_test
+
+TASK_METRICS = [
+    ("total_duration", "Task duration (s)", True),
+    ("num_tool_calls", "Tool calls per task", True),
+    ("input_tokens", "Input tokens per task", True),
+    ("output_tokens", "Output tokens per task", True),
+]
+
+
+def load_result_set(paths: list[Path]) -> dict[str, list[dict[str, Any]]]:
+    """Load results from JSONL files grouped by question, skipping tasks stopped by a budget."""
+    by_question = defaultdict(list)
+    for path in paths:
+        for result in json_codec.read_jsonl(path):
+            if result.get("stopped"):
+                continue
+            by_question[result["question"]].append(result)
+    return dict(by_question)
+
+
+def tool_durations(results: list[dict[str, Any]]) -> dict[str, list[float]]:
+    """Collect every call duration per tool across results."""
+    durations = defaultdict(list)
+    for result in results:
+        for tool_name, metrics in result.get("tool_calls", {}).items():
+            durations[tool_name].extend(metrics["durations"])
+    return durations
+
+
+def metric_values(results: list[dict[str, Any]], key: str) -> list[float]:
+    return [r[key] for r in results if r.get(key) is not None]
+
+
+def compare_metric(base: list[float], cand: list[float], alpha: float, higher_is_worse: bool) -> dict[str, Any]:
+    """Summarize one metric in both sets and classify the change."""
+    p_value = permutation_test(base, cand)
+    base_mean, cand_mean = mean(base), mean(cand)
+    change = (cand_mean - base_mean) / base_mean if base_mean else None
+    significant = p_value is not None and p_value < alpha
+    worse = cand_mean > base_mean if higher_is_worse else cand_mean < base_mean
+    return {
+        "baseline_mean": base_mean,
+        "candidate_mean": cand_mean,
+        "baseline_p50": percentile(base, 50),
+        "candidate_p50": percentile(cand, 50),
+        "baseline_p90": percentile(base, 90),
+        "candidate_p90": percentile(cand, 90),
+        "change": change,
+        "p_value": p_value,
+        "status": ("regression" if worse else "improvement") if significant else "unchanged",
+    }
+
+
+def compare(
+    baseline: dict[str, list[dict[str, Any]]],
+    candidate: dict[str, list[dict[str, Any]]],
+    alpha: float = 0.05,
+) -> dict[str, Any]:
+    """Compare two result sets grouped by question."""
+    shared = [q for q in baseline if q in candidate]
+    base_all = [r for q in shared for r in baseline[q]]
+    cand_all = [r for q in shared for r in candidate[q]]
+
+    # Accuracy is paired per task: only tasks that flipped carry information
+    only_base = sum(1 for q in shared if mean(metric_values(baseline[q], "score")) >= 0.5 > mean(metric_values(candidate[q], "score")))
+    only_cand = sum(1 for q in shared if mean(metric_values(candidate[q], "score")) >= 0.5 > mean(metric_values(baseline[q], "score")))
+    accuracy_p = mcnemar_exact(only_base, only_cand)
+    base_acc, cand_acc = mean(metric_values(base_all, "score")), mean(metric_values(cand_all, "score"))
+    accuracy = {
+        "baseline": base_acc,
+        "candidate": cand_acc,
+        "tasks_lost": only_base,
+        "tasks_gained": only_cand,
+        "p_value": accuracy_p,
+        "status": ("regression" if cand_acc < base_acc else "improvement") if accuracy_p < alpha else "unchanged",
+    }
+
+    overall = {
+        key: compare_metric(metric_values(base_all, key), metric_values(cand_all, key), alpha, higher_is_worse)
+        for key, _, higher_is_worse in TASK_METRICS
+    }
+
+    base_tools, cand_tools = tool_durations(base_all), tool_durations(cand_all)
+    tools = {}
+    for tool_name in sorted(set(base_tools) | set(cand_tools)):
+        tools[tool_name] = {
+            "baseline_calls": len(base_tools.get(tool_name, [])),
+            "candidate_calls": len(cand_tools.get(tool_name, [])),
+            **compare_metric(base_tools.get(tool_name, []), cand_tools.get(tool_name, []), alpha, True),
+        }
+
+    tasks = []
+    for question in shared:
+        base, cand = baseline[question], candidate[question]
+        task = {
+            "question": question,
+            "baseline_score": mean(metric_values(base, "score")),
+            "candidate_score": mean(metric_values(cand, "score")),
+            "runs": (len(base), len(cand)),
+        }
+        for key, _, higher_is_worse in TASK_METRICS:
+            task[key] = compare_metric(metric_values(base, key), metric_values(cand, key), alpha, higher_is_worse)
+        tasks.append(task)
+
+    return {
+        "alpha": alpha,
+        "tasks_compared": len(shared),
+        "only_in_baseline": [q for q in baseline if q not in candidate],
+        "only_in_candidate": [q for q in candidate if q not in baseline],
+        "accuracy": accuracy,
+        "overall": overall,
+        "tools": tools,
+        "tasks": tasks,
+    }
+
+
+STATUS_ICONS = {"regression": "🔴", "improvement": "🟢", "unchanged": "⚪"}
+
+
+def _fmt_change(change: float | None) -> str:
+    return f"{change * 100:+.1f}%" if change is not None else "N/A"
+
+
+def _fmt_p(p_value: float | None) -> str:
+    return f"{p_value:.3f}" if p_value is not None else "N/A"
+
+
+def format_report(comparison: dict[str, Any]) -> str:
+    """Render a comparison as a Markdown report."""
+    acc = comparison["accuracy"]
+    lines = [
+        "# Evaluation Comparison",
+        "",
+        f"- **Tasks compared**: {comparison['tasks_compared']} (significance level {comparison['alpha']})",
+        f"- **Accuracy**: {acc['baseline'] * 100:.1f}% → {acc['candidate'] * 100:.1f}% "
+        f"({acc['tasks_lost']} lost, {acc['tasks_gained']} gained, p={_fmt_p(acc['p_value'])}) {STATUS_ICONS[acc['status']]}",
+    ]
+    if comparison["only_in_baseline"] or comparison["only_in_candidate"]:
+        lines.append(
+            f"- **Unmatched tasks**: {len(comparison['only_in_baseline'])} only in baseline, "
+            f"{len(comparison['only_in_candidate'])} only in candidate"
+        )
+
+    lines += ["", "## Overall", "", "| Metric | Baseline p50 | Candidate p50 | Mean change | p | |", "|---|---|---|---|---|---|"]
+    for key, label, _ in TASK_METRICS:
+        m = comparison["overall"][key]
+        lines.append(
+            f"| {label} | {m['baseline_p50']:.2f} | {m['candidate_p50']:.2f} | {_fmt_change(m['change'])} "
+            f"| {_fmt_p(m['p_value'])} | {STATUS_ICONS[m['status']]} |"
+        )
+
+    lines += [
+        "",
+        "## Tools",
+        "",
+        "| Tool | Calls | p50 (s) | p90 (s) | Mean change | p | |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for tool_name, t in comparison["tools"].items():
+        lines.append(
+            f"| {tool_name} | {t['baseline_calls']} → {t['candidate_calls']} "
+            f"| {t['baseline_p50']:.3f} → {t['candidate_p50']:.3f} | {t['baseline_p90']:.3f} → {t['candidate_p90']:.3f} "
+            f"| {_fmt_change(t['change'])} | {_fmt_p(t['p_value'])} | {STATUS_ICONS[t['status']]} |"
+        )
+
+    changed = [
+        t for t in comparison["tasks"]
+        if t["baseline_score"] != t["candidate_score"]
+        or any(t[key]["status"] != "unchanged" for key, _, _ in TASK_METRICS)
+    ]
+    lines += ["", "## Changed Tasks", ""]
+    if not changed:
+        lines.append("No task changed significantly.")
+    for task in changed:
+        lines += [
+            f"### {task['question']}",
+            "",
+            f"- **Score**: {task['baseline_score']:.2f} → {task['candidate_score']:.2f} (runs: {task['runs'][0]} vs {task['runs'][1]})",
+        ]
+        for key, label, _ in TASK_METRICS:
+            m = task[key]
+            lines.append(
+                f"- **{label}**: {m['baseline_mean']:.2f} → {m['candidate_mean']:.2f} "
+                f"({_fmt_change(m['change'])}, p={_fmt_p(m['p_value'])}) {STATUS_ICONS[m['status']]}"
+            )
+        lines.append("")
+
+    return "\n".join(lines) + "\n"
+
+
+def has_regression(comparison: dict[str, Any]) -> bool:
+    return (
+        comparison["accuracy"]["status"] == "regression"
+        or any(m["status"] == "regression" for m in comparison["overall"].values())
+        or any(t["status"] == "regression" for t in comparison["tools"].values())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare two sets of MCP evaluation results",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Save results from two runs, then compare them
+  python evaluation.py -t stdio -c python -a server_v1.py --results v1.jsonl eval.xml
+  python evaluation.py -t stdio -c python -a server_v2.py --results v2.jsonl eval.xml
+  python compare_results.py -b v1.jsonl -c v2.jsonl
+
+  # Several runs per side, failing CI on significant regressions
+  python compare_results.py -b v1_run*.jsonl -c v2_run*.jsonl --fail-on-regression
+        """,
+    )
+    parser.add_argument("-b", "--baseline", nargs="+", type=Path, required=True, help="Baseline result JSONL file(s)")
+    parser.add_argument("-c", "--candidate", nargs="+", type=Path, required=True, help="Candidate result JSONL file(s)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level for flagging changes (default: 0.05)")
+    parser.add_argument("--json", type=Path, dest="json_output", help="Also write the full comparison as JSON")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any significant regression is found")
+    parser.add_argument("-o", "--output", type=Path, help="Output file for the report (default: stdout)")
+
+    args = parser.parse_args()
+
+    for path in args.baseline + args.candidate:
+        if not path.exists():
+            print(f"Error: Results file not found: {path}")
+            sys.exit(1)
+
+    comparison = compare(load_result_set(args.baseline), load_result_set(args.candidate), args.alpha)
+    report = format_report(comparison)
+
+    if args.json_output:
+        args.json_output.write_text(json_codec.dumps(comparison, indent=True), encoding="utf-8")
+        print(f"✅ Comparison saved to {args.json_output}")
+
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+        print(f"✅ Report saved to {args.output}")
+    else:
+        print(report)
+
+    if args.fail_on_regression and has_regression(comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
-"""Lightweight connection handling for MCP servers."""
+"""Lightweight connection handling for MCP servers.
+
+The mcp package and its transport clients are imported only when a connection
+is opened, and only for the selected transport, so scripts that never connect
+(--help, argument errors, dry runs) skip their import cost.
+"""
 
 from abc import ABC, abstractmethod
 from contextlib import AsyncExitStack
 from typing import Any
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.sse import sse_client
-from mcp.client.stdio import stdio_client
-from mcp.client.streamable_http import streamablehttp_client
+from resource_monitor import child_pids
 
 
 class MCPConnection(ABC):
@@ -37,6 +39,8 @@ class MCPConnection(ABC):
             else:
                 raise ValueError(f"Unexpected context result: {result}")
 
+            from mcp import ClientSession
+
             session_ctx = ClientSession(read, write)
             self.session = await self._stack.enter_async_context(session_ctx)
             await self.session.initialize()
@@ -78,12 +82,28 @@ class MCPConnectionStdio(MCPConnection):
         self.command = command
         self.args = args or []
         self.env = env
+        self.server_pid = None
 
     def _create_context(self):
+        from mcp import StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
         return stdio_client(
             StdioServerParameters(command=self.command, args=self.args, env=self.env)
         )
 
+    async def __aenter__(self):
+        """Start the server process and record its pid where it can be found."""
+        before = set(child_pids())
+        await super().__aenter__()
+        started = set(child_pids()) - before
+        self.server_pid = min(started) if len(started) == 1 else None
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        self.server_pid = None
+
 
 class MCPConnectionSSE(MCPConnection):
     """MCP connection using Server-Sent Events."""
@@ -94,6 +114,8 @@ class MCPConnectionSSE(MCPConnection):
         self.headers = headers or {}
 
     def _create_context(self):
+        from mcp.client.sse import sse_client
+
         return sse_client(url=self.url, headers=self.headers)
 
 
@@ -106,6 +128,8 @@ class MCPConnectionHTTP(MCPConnection):
         self.headers = headers or {}
 
     def _create_context(self):
+        from mcp.client.streamable_http import streamablehttp_client
+
         return streamablehttp_client(url=self.url, headers=self.headers)
 
 
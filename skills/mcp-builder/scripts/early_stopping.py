@@ -0,0 +1,80 @@
+"""Sequential early stopping for evaluation runs.
+
+Applies Wald's sequential probability ratio test (SPRT) to task outcomes so an
+evaluation can stop as soon as it is clear whether accuracy is above or below
+a target, instead of running every qa_pair.
+"""
+
+import math
+
+PASS = "pass"
+FAIL = "fail"
+
+
+class SequentialAccuracyTest:
+    """SPRT deciding whether accuracy is at least target_accuracy.
+
+    The test compares p0 = target - margin against p1 = target + margin, with
+    false-pass and false-fail rates both bounded by 1 - confidence. Accuracy
+    inside the margin may run to the end of the suite undecided.
+    """
+
+    def __init__(self, target_accuracy: float, confidence: float = 0.95, margin: float = 0.05):
+        if not 0 < target_accuracy < 1:
+            raise ValueError("Target accuracy must be between 0 and 1 (exclusive)")
+        if not 0.5 < confidence < 1:
+            raise ValueError("Confidence must be between 0.5 and 1 (exclusive)")
+        if not 0 < margin < 0.5:
+            raise ValueError("Margin must be between 0 and 0.5 (exclusive)")
+
+        self.target_accuracy = target_accuracy
+        self.confidence = confidence
+        self.margin = margin
+        self.p0 = max(target_accuracy - margin, 1e-6)
+        self.p1 = min(target_accuracy + margin, 1 - 1e-6)
+
+        error = 1 - confidence
+        self.upper = math.log((1 - error) / error)
+        self.lower = math.log(error / (1 - error))
+
+        self.llr = 0.0
+        self.successes = 0
+        self.trials = 0
+        self.decision = None
+
+    def update(self, correct: bool) -> str | None:
+        """Add one task outcome; returns PASS or FAIL once decided."""
+        if self.decision:
+            return self.decision
+
+        self.trials += 1
+        if correct:
+            self.successes += 1
+            self.llr += math.log(self.p1 / self.p0)
+        else:
+            self.llr += math.log((1 - self.p1) / (1 - self.p0))
+
+        if self.llr >= self.upper:
+            self.decision = PASS
+        elif self.llr <= self.lower:
+            self.decision = FAIL
+        return self.decision
+
+    def final_outcome(self) -> str:
+        """The SPRT decision, or the observed accuracy against target if undecided."""
+        if self.decision:
+            return self.decision
+        if self.trials and self.successes / self.trials >= self.target_accuracy:
+            return PASS
+        return FAIL
+
+    def format_summary(self, total_tasks: int) -> str:
+        """Render the early stopping outcome as report lines."""
+        skipped = total_tasks - self.trials
+        how = "decided by sequential test" if self.decision else "undecided, based on observed accuracy"
+        return (
+            f"- **Early Stopping**: {self.final_outcome().upper()} ({how}) after {self.trials}/{total_tasks} tasks, "
+            f"{skipped} skipped\n"
+            f"- **Gate**: accuracy ≥ {self.target_accuracy * 100:.1f}% "
+            f"(±{self.margin * 100:.1f}% indifference, {self.confidence * 100:.0f}% confidence)\n"
+        )
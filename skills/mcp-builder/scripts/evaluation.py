@@ -1,22 +1,35 @@
 """MCP Server Evaluation Harness
 
 This script evaluates MCP servers by running test questions against them using Claude.
+
+The anthropic SDK and the MCP transport clients are imported only once an
+evaluation actually starts, keeping --help, argument errors and --dry-run fast.
 """
 
+from __future__ import annotations
+
 import argparse
 import asyncio
-import json
+import random
 import re
 import sys
 import time
 import traceback
 import xml.etree.ElementTree as ET
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any
-
-from anthropic import Anthropic
+from typing import TYPE_CHECKING, Any
 
+import json_codec
+from budget import BudgetExceeded, TokenBudget, usage_counts
 from connections import create_connection
+from early_stopping import FAIL, SequentialAccuracyTest
+from profiling import DEFAULT_SERVER_PROFILER, profile_paths, wrap_server_command, write_harness_profile
+from resource_monitor import ServerResourceMonitor
+from tracing import TraceRecorder, trace_span
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 EVALUATION_PROMPT = """You are an AI assistant with access to tools.
 
@@ -83,41 +96,85 @@ def extract_xml_content(text: str, tag: str) -> str | None:
     return matches[-1].strip() if matches else None
 
 
+def _turn_trace_args(response: Any) -> dict[str, Any]:
+    """Summarize a model response for a trace span."""
+    usage = getattr(response, "usage", None)
+    return {
+        "stop_reason": response.stop_reason,
+        "input_tokens": getattr(usage, "input_tokens", None),
+        "output_tokens": getattr(usage, "output_tokens", None),
+    }
+
+
+def _record_usage(
+    response: Any,
+    usage_totals: dict[str, int],
+    tool_metrics: dict[str, Any],
+    budget: TokenBudget | None,
+):
+    """Add a response's token usage to the task totals and the run budget."""
+    usage = getattr(response, "usage", None)
+    counts = budget.record(usage) if budget else usage_counts(usage)
+    usage_totals["input_tokens"] += counts["input_tokens"]
+    usage_totals["output_tokens"] += counts["output_tokens"]
+    if budget:
+        try:
+            budget.check()
+        except BudgetExceeded as e:
+            # The aborted task's result still reports what it used
+            e.usage = dict(usage_totals)
+            e.tool_metrics = tool_metrics
+            raise
+
+
 async def agent_loop(
     client: Anthropic,
     model: str,
     question: str,
     tools: list[dict[str, Any]],
     connection: Any,
-) -> tuple[str, dict[str, Any]]:
-    """Run the agent loop with MCP tools."""
+    tracer: TraceRecorder | None = None,
+    tid: int = 0,
+    budget: TokenBudget | None = None,
+) -> tuple[str, dict[str, Any], dict[str, int]]:
+    """Run the agent loop with MCP tools.
+
+    Raises BudgetExceeded as soon as a model turn crosses the budget's cap.
+    """
     messages = [{"role": "user", "content": question}]
+    usage_totals = {"input_tokens": 0, "output_tokens": 0}
+    tool_metrics = {}
+    turn = 1
 
-    response = await asyncio.to_thread(
-        client.messages.create,
-        model=model,
-        max_tokens=4096,
-        system=EVALUATION_PROMPT,
-        messages=messages,
-        tools=tools,
-    )
+    with trace_span(tracer, "model_turn", tid, "model", turn=turn) as span_args:
+        response = await asyncio.to_thread(
+            client.messages.create,
+            model=model,
+            max_tokens=4096,
+            system=EVALUATION_PROMPT,
+            messages=messages,
+            tools=tools,
+        )
+        span_args.update(_turn_trace_args(response))
+    _record_usage(response, usage_totals, tool_metrics, budget)
 
     messages.append({"role": "assistant", "content": response.content})
 
-    tool_metrics = {}
-
     while response.stop_reason == "tool_use":
         tool_use = next(block for block in response.content if block.type == "tool_use")
         tool_name = tool_use.name
         tool_input = tool_use.input
 
         tool_start_ts = time.time()
-        try:
-            tool_result = await connection.call_tool(tool_name, tool_input)
-            tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
-        except Exception as e:
-            tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
-            tool_response += traceback.format_exc()
+        with trace_span(tracer, tool_name, tid, "tool") as span_args:
+            try:
+                tool_result = await connection.call_tool(tool_name, tool_input)
+                tool_response = json_codec.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
+            except Exception as e:
+                tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
+                tool_response += traceback.format_exc()
+                span_args["error"] = str(e)
+            span_args["response_chars"] = len(tool_response)
         tool_duration = time.time() - tool_start_ts
 
         if tool_name not in tool_metrics:
@@ -134,21 +191,25 @@ async def agent_loop(
             }]
         })
 
-        response = await asyncio.to_thread(
-            client.messages.create,
-            model=model,
-            max_tokens=4096,
-            system=EVALUATION_PROMPT,
-            messages=messages,
-            tools=tools,
-        )
+        turn += 1
+        with trace_span(tracer, "model_turn", tid, "model", turn=turn) as span_args:
+            response = await asyncio.to_thread(
+                client.messages.create,
+                model=model,
+                max_tokens=4096,
+                system=EVALUATION_PROMPT,
+                messages=messages,
+                tools=tools,
+            )
+            span_args.update(_turn_trace_args(response))
+        _record_usage(response, usage_totals, tool_metrics, budget)
         messages.append({"role": "assistant", "content": response.content})
 
     response_text = next(
         (block.text for block in response.content if hasattr(block, "text")),
         None,
     )
-    return response_text, tool_metrics
+    return response_text, tool_metrics, usage_totals
 
 
 async def evaluate_single_task(
@@ -158,16 +219,49 @@ async def evaluate_single_task(
     tools: list[dict[str, Any]],
     connection: Any,
     task_index: int,
+    tracer: TraceRecorder | None = None,
+    budget: TokenBudget | None = None,
 ) -> dict[str, Any]:
-    """Evaluate a single QA pair with the given tools."""
+    """Evaluate a single QA pair with the given tools.
+
+    A BudgetExceeded raised mid-task carries the partial result, including
+    the tokens used and tools called so far, as its result attribute.
+    """
     start_time = time.time()
+    tid = task_index + 1
 
     print(f"Task {task_index + 1}: Running task with question: {qa_pair['question']}")
-    response, tool_metrics = await agent_loop(client, model, qa_pair["question"], tools, connection)
+    if tracer:
+        tracer.name_track(tid, f"Task {tid}")
 
-    response_value = extract_xml_content(response, "response")
-    summary = extract_xml_content(response, "summary")
-    feedback = extract_xml_content(response, "feedback")
+    with trace_span(tracer, "task", tid, "task", question=qa_pair["question"]) as span_args:
+        try:
+            response, tool_metrics, usage = await agent_loop(
+                client, model, qa_pair["question"], tools, connection, tracer, tid, budget
+            )
+        except BudgetExceeded as e:
+            span_args["stopped"] = str(e)
+            e.result = {
+                "question": qa_pair["question"],
+                "expected": qa_pair["answer"],
+                "actual": None,
+                "score": 0,
+                "total_duration": time.time() - start_time,
+                "tool_calls": e.tool_metrics,
+                "num_tool_calls": sum(len(metrics["durations"]) for metrics in e.tool_metrics.values()),
+                "input_tokens": e.usage["input_tokens"],
+                "output_tokens": e.usage["output_tokens"],
+                "summary": None,
+                "feedback": None,
+                "stopped": str(e),
+            }
+            raise
+
+        with trace_span(tracer, "extract_response", tid, "harness"):
+            response_value = extract_xml_content(response, "response")
+            summary = extract_xml_content(response, "summary")
+            feedback = extract_xml_content(response, "feedback")
+        span_args["correct"] = bool(response_value == qa_pair["answer"]) if response_value else False
 
     duration_seconds = time.time() - start_time
 
@@ -179,6 +273,8 @@ async def evaluate_single_task(
         "total_duration": duration_seconds,
         "tool_calls": tool_metrics,
         "num_tool_calls": sum(len(metrics["durations"]) for metrics in tool_metrics.values()),
+        "input_tokens": usage["input_tokens"],
+        "output_tokens": usage["output_tokens"],
         "summary": summary,
         "feedback": feedback,
     }
@@ -193,7 +289,7 @@ REPORT_HEADER = """
 - **Average Task Duration**: {average_duration_s:.2f}s
 - **Average Tool Calls per Task**: {average_tool_calls:.2f}
 - **Total Tool Calls**: {total_tool_calls}
-
+{extra_summary}
 ---
 """
 
@@ -205,6 +301,7 @@ TASK_TEMPLATE = """
 **Actual Answer**: `{actual_answer}`
 **Correct**: {correct_indicator}
 **Duration**: {total_duration:.2f}s
+**Tokens**: {input_tokens:,} input / {output_tokens:,} output
 **Tool Calls**: {tool_calls}
 
 **Summary**
@@ -221,53 +318,119 @@ async def run_evaluation(
     eval_path: Path,
     connection: Any,
     model: str = "claude-3-7-sonnet-20250219",
+    tracer: TraceRecorder | None = None,
+    early_stop: SequentialAccuracyTest | None = None,
+    seed: int | None = None,
+    budget: TokenBudget | None = None,
+    tools_override: list[dict[str, Any]] | None = None,
+    results_path: Path | None = None,
 ) -> str:
-    """Run evaluation with MCP server tools."""
+    """Run evaluation with MCP server tools.
+
+    With early_stop, tasks run in a randomized order and the run stops as soon
+    as the sequential test decides whether the accuracy target is met. With
+    budget, usage is tracked live and the run stops cleanly at its caps.
+    tools_override replaces the server's tool definitions sent to the model,
+    e.g. with a compacted variant from analyze_tools.py. results_path saves
+    the per-task result dicts as JSONL for compare_results.py.
+    """
     print("🚀 Starting Evaluation")
 
+    from anthropic import Anthropic
+
     client = Anthropic()
 
-    tools = await connection.list_tools()
+    if tracer:
+        tracer.name_track(0, "Harness")
+
+    with trace_span(tracer, "list_tools", 0, "harness"):
+        tools = await connection.list_tools()
     print(f"📋 Loaded {len(tools)} tools from MCP server")
 
+    if tools_override is not None:
+        unknown = {t["name"] for t in tools_override} - {t["name"] for t in tools}
+        if unknown:
+            print(f"Warning: Tool definitions not provided by the server: {', '.join(sorted(unknown))}")
+        tools = tools_override
+        print(f"📋 Using {len(tools)} tool definitions from --tools-file")
+
     qa_pairs = parse_evaluation_file(eval_path)
     print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
 
+    total_tasks = len(qa_pairs)
+    if budget:
+        estimate = budget.estimate(qa_pairs, tools, EVALUATION_PROMPT)
+        print(budget.format_estimate(estimate))
+        if budget.max_tokens is not None and estimate["input_tokens"] + estimate["output_tokens"] > budget.max_tokens:
+            print(f"Warning: Estimate exceeds --max-tokens {budget.max_tokens:,}; the run will likely stop early")
+        if budget.max_cost is not None and estimate["cost"] > budget.max_cost:
+            print(f"Warning: Estimate exceeds --max-cost ${budget.max_cost:.2f}; the run will likely stop early")
+
+    if early_stop:
+        random.Random(seed).shuffle(qa_pairs)
+
     results = []
     for i, qa_pair in enumerate(qa_pairs):
         print(f"Processing task {i + 1}/{len(qa_pairs)}")
-        result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
+        try:
+            result = await evaluate_single_task(client, model, qa_pair, tools, connection, i, tracer, budget)
+        except BudgetExceeded as e:
+            print(f"🛑 Budget exhausted during task {i + 1}: {e}; skipping {total_tasks - i - 1} remaining")
+            results.append(e.result)
+            if tracer:
+                tracer.instant("budget_exceeded", 0, "harness", task=i + 1, reason=str(e))
+            break
         results.append(result)
-
-    correct = sum(r["score"] for r in results)
-    accuracy = (correct / len(results)) * 100 if results else 0
-    average_duration_s = sum(r["total_duration"] for r in results) / len(results) if results else 0
-    average_tool_calls = sum(r["num_tool_calls"] for r in results) / len(results) if results else 0
-    total_tool_calls = sum(r["num_tool_calls"] for r in results)
-
-    report = REPORT_HEADER.format(
-        correct=correct,
-        total=len(results),
-        accuracy=accuracy,
-        average_duration_s=average_duration_s,
-        average_tool_calls=average_tool_calls,
-        total_tool_calls=total_tool_calls,
-    )
-
-    report += "".join([
-        TASK_TEMPLATE.format(
-            task_num=i + 1,
-            question=qa_pair["question"],
-            expected_answer=qa_pair["answer"],
-            actual_answer=result["actual"] or "N/A",
-            correct_indicator="✅" if result["score"] else "❌",
-            total_duration=result["total_duration"],
-            tool_calls=json.dumps(result["tool_calls"], indent=2),
-            summary=result["summary"] or "N/A",
-            feedback=result["feedback"] or "N/A",
+        if budget:
+            print(budget.format_progress())
+
+        if early_stop and early_stop.update(bool(result["score"])):
+            if tracer:
+                tracer.instant("early_stop", 0, "harness", task=i + 1, decision=early_stop.decision)
+            print(f"🛑 Sequential test decided {early_stop.decision.upper()} after {i + 1} tasks; skipping {total_tasks - i - 1}")
+            break
+
+    if results_path:
+        json_codec.write_jsonl(results_path, ({**result, "model": model} for result in results))
+        print(f"✅ Results saved to {results_path}")
+
+    with trace_span(tracer, "build_report", 0, "harness"):
+        # A task stopped by the budget has no answer; it is listed but not graded
+        graded = [r for r in results if not r.get("stopped")]
+        correct = sum(r["score"] for r in graded)
+        accuracy = (correct / len(graded)) * 100 if graded else 0
+        average_duration_s = sum(r["total_duration"] for r in graded) / len(graded) if graded else 0
+        average_tool_calls = sum(r["num_tool_calls"] for r in graded) / len(graded) if graded else 0
+        total_tool_calls = sum(r["num_tool_calls"] for r in results)
+
+        report = REPORT_HEADER.format(
+            correct=correct,
+            total=len(graded),
+            accuracy=accuracy,
+            average_duration_s=average_duration_s,
+            average_tool_calls=average_tool_calls,
+            total_tool_calls=total_tool_calls,
+            extra_summary=(budget.format_summary() if budget else "")
+            + (early_stop.format_summary(total_tasks) if early_stop else ""),
         )
-        for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
-    ])
+
+        report += "".join([
+            TASK_TEMPLATE.format(
+                task_num=i + 1,
+                question=qa_pair["question"],
+                expected_answer=qa_pair["answer"],
+                actual_answer=result["actual"] or "N/A",
+                correct_indicator=f"🛑 stopped ({result['stopped']})" if result.get("stopped")
+                else "✅" if result["score"] else "❌",
+                total_duration=result["total_duration"],
+                input_tokens=result["input_tokens"],
+                output_tokens=result["output_tokens"],
+                tool_calls=json_codec.dumps(result["tool_calls"], indent=True),
+                summary=result["summary"] or "N/A",
+                feedback=result["feedback"] or "N/A",
+            )
+            for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
+        ])
 
     return report
 
@@ -333,6 +496,26 @@ Examples:
     remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
 
     parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse the evaluation file and arguments, print the plan and exit without connecting")
+    parser.add_argument("--results", type=Path, help="Save per-task results as JSONL (input for compare_results.py)")
+    parser.add_argument("--tools-file", type=Path, help="Send tool definitions from this JSON file instead of the server's (e.g. from analyze_tools.py --compact-output)")
+
+    budget_group = parser.add_argument_group("budget options")
+    budget_group.add_argument("--max-tokens", type=int, help="Stop the run cleanly once total input+output tokens reach this cap")
+    budget_group.add_argument("--max-cost", type=float, help="Stop the run cleanly once estimated cost in USD reaches this cap")
+    budget_group.add_argument("--input-price", type=float, help="USD per million input tokens (default: known price for --model)")
+    budget_group.add_argument("--output-price", type=float, help="USD per million output tokens (default: known price for --model)")
+
+    stop_group = parser.add_argument_group("early stopping options")
+    stop_group.add_argument("--target-accuracy", type=float, help="Stop once a sequential test decides accuracy is above or below this target (0-1); exits 1 on FAIL")
+    stop_group.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the sequential test (default: 0.95)")
+    stop_group.add_argument("--margin", type=float, default=0.05, help="Indifference margin around the target accuracy (default: 0.05)")
+    stop_group.add_argument("--seed", type=int, help="Random seed for the task order (default: random)")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace-event JSON timeline (open in Perfetto or chrome://tracing)")
+    parser.add_argument("--profile", nargs="?", const="all", choices=["harness", "server", "all"], help="Profile the harness (cProfile), the stdio server (sampling profiler) or both [default when given: all]")
+    parser.add_argument("--monitor", action="store_true", help="Sample the stdio server's CPU, RSS, open FDs and threads from /proc and add a resource summary to the report")
+    parser.add_argument("--monitor-interval", type=float, default=0.5, help="Seconds between server resource samples (default: 0.5)")
+    parser.add_argument("--server-profiler", default=DEFAULT_SERVER_PROFILER, help=f"Command prefix used to launch the stdio server under a profiler; {{output}} is replaced with the profile path (default: '{DEFAULT_SERVER_PROFILER}')")
 
     args = parser.parse_args()
 
@@ -340,14 +523,53 @@ Examples:
         print(f"Error: Evaluation file not found: {args.eval_file}")
         sys.exit(1)
 
+    tools_override = None
+    if args.tools_file:
+        try:
+            tools_override = json_codec.loads(args.tools_file.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read tool definitions from {args.tools_file}: {e}")
+            sys.exit(1)
+
+    early_stop = None
+    if args.target_accuracy is not None:
+        try:
+            early_stop = SequentialAccuracyTest(args.target_accuracy, args.confidence, args.margin)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    # Always tracked for the estimate, live totals and report; caps only apply when given
+    try:
+        budget = TokenBudget(args.model, args.max_tokens, args.max_cost, args.input_price, args.output_price)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
     headers = parse_headers(args.headers) if args.headers else None
     env_vars = parse_env_vars(args.env) if args.env else None
 
+    harness_profile_path, server_profile_path = profile_paths(args.output)
+    profile_harness = args.profile in ("harness", "all")
+    profile_server = args.profile in ("server", "all") and args.transport == "stdio"
+    if args.profile == "server" and args.transport != "stdio":
+        print("Warning: --profile server only applies to the stdio transport")
+
+    server_command, server_args = args.command, args.args
+    if profile_server and args.command:
+        wrapped = wrap_server_command(args.command, args.args, args.server_profiler, server_profile_path)
+        if wrapped:
+            server_command, server_args = wrapped
+            print(f"🔬 Profiling MCP server with: {server_command} {' '.join(server_args)}")
+        else:
+            print(f"Warning: Server profiler not found, running server unprofiled: {args.server_profiler.split()[0]}")
+            profile_server = False
+
     try:
         connection = create_connection(
             transport=args.transport,
-            command=args.command,
-            args=args.args,
+            command=server_command,
+            args=server_args,
             env=env_vars,
             url=args.url,
             headers=headers,
@@ -356,11 +578,62 @@ Examples:
         print(f"Error: {e}")
         sys.exit(1)
 
+    if args.dry_run:
+        qa_pairs = parse_evaluation_file(args.eval_file)
+        target = " ".join([server_command] + (server_args or [])) if args.transport == "stdio" else args.url
+        print(f"📋 Parsed {len(qa_pairs)} evaluation tasks from {args.eval_file}")
+        print(f"🔗 Would connect via {args.transport}: {target}")
+        print(f"🤖 Model: {args.model}")
+        sys.exit(0 if qa_pairs else 1)
+
+    tracer = TraceRecorder() if args.trace else None
+    profiler = None
+    if profile_harness:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
     print(f"🔗 Connecting to MCP server via {args.transport}...")
 
     async with connection:
         print("✅ Connected successfully")
-        report = await run_evaluation(args.eval_file, connection, args.model)
+
+        monitor = None
+        eval_connection = connection
+        if args.monitor:
+            server_pid = getattr(connection, "server_pid", None)
+            if server_pid:
+                monitor = ServerResourceMonitor(server_pid, args.monitor_interval)
+                eval_connection = monitor.instrument(connection)
+                print(f"📈 Sampling server process {server_pid} every {args.monitor_interval}s")
+            else:
+                print("Warning: --monitor needs a local stdio server process; resource sampling disabled")
+
+        if profiler:
+            profiler.enable()
+        try:
+            async with monitor or nullcontext():
+                report = await run_evaluation(
+                    args.eval_file,
+                    eval_connection,
+                    args.model,
+                    tracer=tracer,
+                    early_stop=early_stop,
+                    seed=args.seed,
+                    budget=budget,
+                    tools_override=tools_override,
+                    results_path=args.results,
+                )
+        finally:
+            if profiler:
+                profiler.disable()
+            # Written even when the run fails, so the failing span can be inspected
+            if tracer:
+                tracer.write(args.trace)
+                print(f"\n✅ Trace saved to {args.trace}")
+
+        if monitor:
+            report += monitor.format_report()
 
         if args.output:
             args.output.write_text(report)
@@ -368,6 +641,20 @@ Examples:
         else:
             print("\n" + report)
 
+    if profiler:
+        summary_path = write_harness_profile(profiler, harness_profile_path)
+        print(f"✅ Harness profile saved to {harness_profile_path} (summary: {summary_path})")
+
+    # The sampling profiler writes its output once the server process exits
+    if profile_server:
+        if server_profile_path.exists():
+            print(f"✅ Server profile saved to {server_profile_path}")
+        else:
+            print(f"Warning: Server profiler did not produce {server_profile_path}")
+
+    if early_stop and early_stop.final_outcome() == FAIL:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Pluggable JSON codec for the evaluation harness.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Set MCP_EVAL_JSON=stdlib to force the fallback. Objects such as
+MCP content blocks (pydantic models) are serialized through model_dump().
+The backend is chosen on first use so importing this module stays cheap.
+"""
+
+import importlib.util
+import json
+import os
+from typing import Any
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects the JSON libraries do not handle natively."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", exclude_none=True)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdlibCodec:
+    """Codec backed by the standard library json module."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        return json.dumps(obj, indent=2 if indent else None, default=_default, ensure_ascii=False)
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        option = self._orjson.OPT_NON_STR_KEYS | (self._orjson.OPT_INDENT_2 if indent else 0)
+        return self._orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+CODECS = {"stdlib": StdlibCodec}
+if importlib.util.find_spec("orjson") is not None:
+    CODECS["orjson"] = OrjsonCodec
+
+
+def get_codec(name: str | None = None):
+    """Return a codec by name, or the fastest available one."""
+    name = name or os.environ.get("MCP_EVAL_JSON")
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"Unknown or unavailable JSON codec: {name}. Available: {', '.join(CODECS)}")
+        return CODECS[name]()
+    return OrjsonCodec() if "orjson" in CODECS else StdlibCodec()
+
+
+_codec = None
+
+
+def _default_codec():
+    global _codec
+    if _codec is None:
+        _codec = get_codec()
+    return _codec
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, pretty-printed with 2 spaces if indent."""
+    return _default_codec().dumps(obj, indent)
+
+
+def loads(data: str | bytes) -> Any:
+    """Deserialize a JSON string or bytes."""
+    return _default_codec().loads(data)
+
+
+def write_jsonl(path, records) -> int:
+    """Write records to path as JSON Lines; returns the number written."""
+    codec = _default_codec()
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(codec.dumps(record))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def read_jsonl(path) -> list[Any]:
+    """Read a JSON Lines file, skipping blank lines."""
+    codec = _default_codec()
+    with open(path, "rb") as f:
+        return [codec.loads(line) for line in f if line.strip()]
@@ -0,0 +1,66 @@
+"""Profiling support for evaluation runs.
+
+Profiles the harness's own event loop with cProfile and can launch a stdio MCP
+server under an external sampling profiler (py-spy by default). Both profiles
+are written next to the evaluation report.
+"""
+
+from __future__ import annotations
+
+import io
+import shlex
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+
+DEFAULT_SERVER_PROFILER = "py-spy record --format speedscope --output {output} --"
+
+
+def profile_paths(report_path: Path | None) -> tuple[Path, Path]:
+    """Return (harness_profile, server_profile) paths next to the report."""
+    base = report_path if report_path else Path.cwd() / "evaluation"
+    stem = base.with_suffix("")
+    return (
+        stem.with_name(stem.name + ".harness.prof"),
+        stem.with_name(stem.name + ".server.speedscope.json"),
+    )
+
+
+def wrap_server_command(
+    command: str,
+    args: list[str] | None,
+    profiler_template: str,
+    output: Path,
+) -> tuple[str, list[str]] | None:
+    """Prefix a stdio server command with a sampling profiler.
+
+    The template is split shell-style and {output} is replaced with the
+    profile path. Returns None when the profiler executable is not installed.
+    """
+    profiler = [part.replace("{output}", str(output)) for part in shlex.split(profiler_template)]
+    if not profiler or shutil.which(profiler[0]) is None:
+        return None
+    return profiler[0], profiler[1:] + [command] + list(args or [])
+
+
+def write_harness_profile(profiler: cProfile.Profile, path: Path, limit: int = 40) -> Path:
+    """Dump cProfile stats to path and a cumulative-time summary beside it.
+
+    The .prof file can be loaded with pstats, snakeviz or similar viewers.
+    """
+    import pstats
+
+    profiler.dump_stats(str(path))
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(limit)
+    stream.write("\n--- Harness hot spots ---\n")
+    stats.sort_stats("tottime").print_stats(r"json|extract_xml_content|run_evaluation|format", limit)
+
+    summary_path = path.with_suffix(".txt")
+    summary_path.write_text(stream.getvalue())
+    return summary_path
@@ -0,0 +1,248 @@
+"""Resource sampling for MCP server processes.
+
+Periodically reads CPU, RSS, open file descriptors and thread count for the
+server process tree from /proc while an evaluation runs, lines each tool
+call's latency up against those samples, and summarizes peaks and growth.
+Linux only; on other platforms no samples are collected.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from stats import pearson
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def child_pids(pid: int | str = "self") -> list[int]:
+    """Return the direct children of a process, read from /proc."""
+    children = []
+    task_dir = Path(f"/proc/{pid}/task")
+    try:
+        tasks = list(task_dir.iterdir())
+    except OSError:
+        return children
+    for task in tasks:
+        try:
+            children.extend(int(p) for p in (task / "children").read_text().split())
+        except OSError:
+            continue
+    return children
+
+
+def process_tree(pid: int) -> list[int]:
+    """Return pid and all of its descendants.
+
+    Servers are often started through wrappers (npx, uv run, a profiler), so
+    the process doing the work may be a grandchild of the one we launched.
+    """
+    tree = [pid]
+    for child in child_pids(pid):
+        tree.extend(process_tree(child))
+    return tree
+
+
+def read_process_stats(pid: int) -> dict[str, int] | None:
+    """Read CPU ticks, RSS bytes, open fds and thread count for one process."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        statm = Path(f"/proc/{pid}/statm").read_text()
+    except OSError:
+        return None
+
+    fields = stat.rsplit(")", 1)[1].split()
+    try:
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        fds = 0
+
+    return {
+        "cpu_ticks": int(fields[11]) + int(fields[12]),
+        "rss_bytes": int(statm.split()[1]) * PAGE_SIZE,
+        "fds": fds,
+        "threads": int(fields[17]),
+    }
+
+
+class ServerResourceMonitor:
+    """Samples a server process tree and records tool call timings."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[dict[str, float | None]] = []
+        self.calls: list[dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._task = None
+        self._last_ticks = None
+        self._last_time = None
+
+    def now(self) -> float:
+        """Seconds since the monitor was created, on the sample clock."""
+        return time.perf_counter() - self._origin
+
+    def sample(self):
+        """Take one sample of the whole process tree."""
+        totals = {"cpu_ticks": 0, "rss_bytes": 0, "fds": 0, "threads": 0}
+        found = False
+        for pid in process_tree(self.pid):
+            stats = read_process_stats(pid)
+            if stats:
+                found = True
+                for key in totals:
+                    totals[key] += stats[key]
+        if not found:
+            return
+
+        now = self.now()
+        # The first sample only primes the tick counter; it has no CPU reading
+        cpu_percent = None
+        if self._last_ticks is not None and now > self._last_time:
+            delta_ticks = max(totals["cpu_ticks"] - self._last_ticks, 0)
+            cpu_percent = delta_ticks / CLOCK_TICKS / (now - self._last_time) * 100
+        self._last_ticks = totals["cpu_ticks"]
+        self._last_time = now
+
+        self.samples.append({
+            "t": now,
+            "cpu_percent": cpu_percent,
+            "rss_bytes": totals["rss_bytes"],
+            "fds": totals["fds"],
+            "threads": totals["threads"],
+        })
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.sample()
+
+    def instrument(self, connection: Any) -> "MonitoredConnection":
+        """Wrap a connection so each tool call is timed against the samples."""
+        return MonitoredConnection(connection, self)
+
+    def record_call(self, tool_name: str, start: float, end: float):
+        self.calls.append({"tool": tool_name, "start": start, "end": end, "duration": end - start})
+
+    def _samples_during(self, start: float, end: float) -> list[dict[str, float | None]]:
+        """Samples taken during a call, or the first one after it if none were."""
+        during = [s for s in self.samples if start <= s["t"] <= end]
+        if during:
+            return during
+        after = [s for s in self.samples if s["t"] > end]
+        return after[:1]
+
+    def correlate_calls(self) -> list[dict[str, Any]]:
+        """Attach the server's CPU and RSS observed during each tool call."""
+        correlated = []
+        for call in self.calls:
+            window = self._samples_during(call["start"], call["end"])
+            correlated.append({
+                **call,
+                "cpu_percent": max((s["cpu_percent"] for s in window if s["cpu_percent"] is not None), default=None),
+                "rss_bytes": max((s["rss_bytes"] for s in window), default=None),
+            })
+        return correlated
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize peaks, growth and latency/CPU correlation."""
+        if not self.samples:
+            return {}
+
+        first, last = self.samples[0], self.samples[-1]
+        elapsed_min = (last["t"] - first["t"]) / 60
+        rss_growth = last["rss_bytes"] - first["rss_bytes"]
+        cpu_values = [s["cpu_percent"] for s in self.samples if s["cpu_percent"] is not None] or [0.0]
+
+        correlated = [c for c in self.correlate_calls() if c["cpu_percent"] is not None]
+        return {
+            "samples": len(self.samples),
+            "duration_s": last["t"] - first["t"],
+            "cpu_percent_peak": max(cpu_values),
+            "cpu_percent_mean": sum(cpu_values) / len(cpu_values),
+            "rss_bytes_start": first["rss_bytes"],
+            "rss_bytes_peak": max(s["rss_bytes"] for s in self.samples),
+            "rss_bytes_end": last["rss_bytes"],
+            "rss_growth_bytes": rss_growth,
+            "rss_growth_bytes_per_min": rss_growth / elapsed_min if elapsed_min else 0.0,
+            "fds_start": first["fds"],
+            "fds_peak": max(s["fds"] for s in self.samples),
+            "fds_end": last["fds"],
+            "threads_peak": max(s["threads"] for s in self.samples),
+            "threads_end": last["threads"],
+            "latency_cpu_correlation": pearson(
+                [c["duration"] for c in correlated],
+                [c["cpu_percent"] for c in correlated],
+            ),
+            "slowest_calls": sorted(correlated, key=lambda c: c["duration"], reverse=True)[:5],
+        }
+
+    def format_report(self) -> str:
+        """Render the resource summary as a Markdown report section."""
+        summary = self.summary()
+        if not summary:
+            return "\n## Server Resources\n\nNo samples collected (server process not found or /proc unavailable).\n"
+
+        mb = 1024 * 1024
+        correlation = summary["latency_cpu_correlation"]
+        lines = [
+            "",
+            "## Server Resources",
+            "",
+            f"- **Samples**: {summary['samples']} over {summary['duration_s']:.1f}s",
+            f"- **CPU**: peak {summary['cpu_percent_peak']:.0f}%, mean {summary['cpu_percent_mean']:.0f}%",
+            f"- **RSS**: {summary['rss_bytes_start'] / mb:.1f} MB → {summary['rss_bytes_end'] / mb:.1f} MB "
+            f"(peak {summary['rss_bytes_peak'] / mb:.1f} MB, growth {summary['rss_growth_bytes_per_min'] / mb:+.2f} MB/min)",
+            f"- **Open FDs**: {summary['fds_start']} → {summary['fds_end']} (peak {summary['fds_peak']})",
+            f"- **Threads**: peak {summary['threads_peak']}, end {summary['threads_end']}",
+            f"- **Tool latency vs CPU correlation**: {correlation:.2f}" if correlation is not None
+            else "- **Tool latency vs CPU correlation**: N/A",
+        ]
+
+        if summary["slowest_calls"]:
+            lines += [
+                "",
+                "| Tool | Latency (s) | Server CPU (%) | Server RSS (MB) |",
+                "|---|---|---|---|",
+            ]
+            for call in summary["slowest_calls"]:
+                lines.append(
+                    f"| {call['tool']} | {call['duration']:.2f} | {call['cpu_percent']:.0f} | {call['rss_bytes'] / mb:.1f} |"
+                )
+
+        return "\n".join(lines) + "\n\n---\n"
+
+
+class MonitoredConnection:
+    """Connection proxy that reports tool call timings to a monitor."""
+
+    def __init__(self, connection: Any, monitor: ServerResourceMonitor):
+        self._connection = connection
+        self._monitor = monitor
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        return await self._connection.list_tools()
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        start = self._monitor.now()
+        try:
+            return await self._connection.call_tool(tool_name, arguments)
+        finally:
+            self._monitor.record_call(tool_name, start, self._monitor.now())
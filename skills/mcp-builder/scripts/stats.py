@@ -0,0 +1,76 @@
+"""Small statistics helpers shared by the benchmark and comparison scripts.
+
+Pure Python so the harness keeps its minimal dependency set.
+"""
+
+import itertools
+import math
+import random
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def pearson(xs: list[float], ys: list[float]) -> float | None:
+    """Pearson correlation coefficient, or None when undefined."""
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x, mean_y = mean(xs), mean(ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    if var_x == 0 or var_y == 0:
+        return None
+    return cov / (var_x * var_y) ** 0.5
+
+
+def permutation_test(a: list[float], b: list[float], iterations: int = 10000, seed: int = 0) -> float | None:
+    """Two-sided p-value for a difference in means between two samples.
+
+    Enumerates every relabelling when that is cheaper than the requested
+    number of random resamples. Returns None when either sample is empty.
+    """
+    if not a or not b:
+        return None
+
+    observed = abs(mean(a) - mean(b))
+    pooled = a + b
+    n_a = len(a)
+    total = sum(pooled)
+
+    def diff(indices) -> float:
+        sum_a = sum(pooled[i] for i in indices)
+        return abs(sum_a / n_a - (total - sum_a) / (len(pooled) - n_a))
+
+    if math.comb(len(pooled), n_a) <= iterations:
+        splits = list(itertools.combinations(range(len(pooled)), n_a))
+        extreme = sum(1 for indices in splits if diff(indices) >= observed - 1e-12)
+        return extreme / len(splits)
+
+    rng = random.Random(seed)
+    population = range(len(pooled))
+    extreme = sum(1 for _ in range(iterations) if diff(rng.sample(population, n_a)) >= observed - 1e-12)
+    return (extreme + 1) / (iterations + 1)
+
+
+def mcnemar_exact(only_a: int, only_b: int) -> float:
+    """Exact two-sided McNemar p-value from the discordant pair counts."""
+    n = only_a + only_b
+    if n == 0:
+        return 1.0
+    k = min(only_a, only_b)
+    tail = sum(math.comb(n, i) for i in range(k + 1)) / 2 ** n
+    return min(1.0, 2 * tail)
@@ -0,0 +1,91 @@
+"""Chrome trace-event recording for evaluation runs.
+
+Spans are collected in memory and written in the Chrome trace-event JSON
+format, which opens offline in Perfetto (ui.perfetto.dev) or chrome://tracing.
+Each evaluation task gets its own track.
+"""
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+import json_codec
+
+
+class TraceRecorder:
+    """Collects complete ("X") trace events grouped into per-task tracks."""
+
+    def __init__(self, process_name: str = "evaluation"):
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self.events: list[dict[str, Any]] = [{
+            "name": "process_name",
+            "ph": "M",
+            "pid": self._pid,
+            "tid": 0,
+            "args": {"name": process_name},
+        }]
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def name_track(self, tid: int, name: str):
+        """Label a track so it shows a readable name in the viewer."""
+        self.events.append({
+            "name": "thread_name",
+            "ph": "M",
+            "pid": self._pid,
+            "tid": tid,
+            "args": {"name": name},
+        })
+
+    @contextmanager
+    def span(self, name: str, tid: int, cat: str = "", **args):
+        """Record the enclosed block as a span; yields a dict for extra args."""
+        start = self._now_us()
+        extra = dict(args)
+        try:
+            yield extra
+        except BaseException as e:
+            extra["error"] = repr(e)
+            raise
+        finally:
+            self.events.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now_us() - start,
+                "pid": self._pid,
+                "tid": tid,
+                "args": extra,
+            })
+
+    def instant(self, name: str, tid: int, cat: str = "", **args):
+        """Record a zero-duration marker on a track."""
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": self._now_us(),
+            "pid": self._pid,
+            "tid": tid,
+            "args": args,
+        })
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path):
+        """Write the collected events as a Chrome trace-event JSON file."""
+        Path(path).write_text(json_codec.dumps(self.to_dict()), encoding="utf-8")
+
+
+def trace_span(tracer: TraceRecorder | None, name: str, tid: int, cat: str = "", **args):
+    """Return tracer.span(...) or a no-op context when tracing is disabled."""
+    if tracer is None:
+        return nullcontext({})
+    return tracer.span(name, tid, cat, **args)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Frontmatter Parsing Benchmark
+
+Generates a tree of synthetic skills and times the shared frontmatter parser
+(cold and with a warm cache) against the whole-file parsing the tools used
+before it.
+
+Usage:
+    python benchmark_frontmatter.py [--skills 5000] [--body-kb 20] [--runs 3]
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+import frontmatter
+
+SKILL_TEMPLATE = """---
+name: skill-{index}
+description: >
+  Synthetic skill {index} used to benchmark frontmatter parsing. Use it when
+  measuring how quickly tools read SKILL.md headers.
+license: MIT
+metadata:
+  version: "1.{index}"
+---
+
+# Skill {index}
+
+"""
+
+
+def make_skills(root: Path, count: int, body_kb: int) -> list:
+    """Write count SKILL.md files with body_kb KB bodies; returns their paths."""
+    body = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 20)
+    body = body * max(1, body_kb * 1024 // len(body))
+    paths = []
+    for index in range(count):
+        skill_dir = root / f"skill-{index}"
+        skill_dir.mkdir()
+        path = skill_dir / "SKILL.md"
+        path.write_text(SKILL_TEMPLATE.format(index=index) + body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def legacy_regex(path: Path):
+    """The old import_skills.py approach: read everything, split, regex a field."""
+    content = path.read_text(encoding="utf-8")
+    parts = content.split('---', 2)
+    for line in parts[1].split('\n'):
+        match = re.match(r'^name\s*:\s*(.+)$', line.strip())
+        if match:
+            return match.group(1)
+
+
+def legacy_yaml(path: Path):
+    """The old quick_validate.py approach: read everything, regex, yaml.safe_load."""
+    content = path.read_text()
+    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
+    return yaml.safe_load(match.group(1))
+
+
+def shared_cold(path: Path):
+    frontmatter.clear_cache()
+    return frontmatter.read_frontmatter(path)
+
+
+def shared_warm(path: Path):
+    return frontmatter.read_frontmatter(path)
+
+
+CASES = [
+    ("legacy regex (whole file)", legacy_regex),
+    ("legacy yaml.safe_load (whole file)", legacy_yaml),
+    ("shared parser, cold cache", shared_cold),
+    ("shared parser, warm cache", shared_warm),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SKILL.md frontmatter parsing")
+    parser.add_argument("--skills", type=int, default=5000, help="Number of synthetic skills (default: 5000)")
+    parser.add_argument("--body-kb", type=int, default=20, help="Body size of each SKILL.md in KB (default: 20)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case; the best is reported (default: 3)")
+    args = parser.parse_args()
+
+    loader = "CSafeLoader" if frontmatter.SafeLoader is getattr(yaml, "CSafeLoader", None) else "SafeLoader"
+    print(f"YAML loader: {loader}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_skills(Path(tmp), args.skills, args.body_kb)
+        print(f"Generated {len(paths)} skills with {args.body_kb} KB bodies\n")
+
+        print(f"{'Case':<36} {'Total':>11}  {'Per file':>14}  {'vs first':>8}")
+        baseline = None
+        for label, parse in CASES:
+            if parse is shared_warm:
+                # Populate the cache so the warm case measures lookups only
+                for path in paths:
+                    frontmatter.read_frontmatter(path)
+            best = float("inf")
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                for path in paths:
+                    parse(path)
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            per_file_us = best / len(paths) * 1e6
+            print(f"{label:<36} {best * 1000:>9.1f}ms  {per_file_us:>8.1f}µs/file  {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
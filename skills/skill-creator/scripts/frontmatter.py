@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Shared SKILL.md frontmatter parser.
+
+Reads only the bytes up to the closing '---' line, parses them with the C
+YAML loader when PyYAML was built with libyaml, and caches results by path,
+mtime and size so tools that look at the same skills repeatedly parse each
+file once. Without PyYAML, simple 'key: value' frontmatter is still parsed.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+try:
+    import yaml
+    SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+# First read size; most frontmatter fits well within this
+HEADER_CHUNK = 4096
+
+DELIMITER = b'---'
+
+# A '---' line after the opening one, including the newline before it
+CLOSING_RE = re.compile(rb'\n---[ \t]*(?:\r?\n|$)')
+
+
+class FrontmatterError(ValueError):
+    """SKILL.md has missing or malformed frontmatter."""
+
+
+class Frontmatter(NamedTuple):
+    data: Dict[str, Any]
+    # Byte offset of the body, just past the closing '---' line
+    body_offset: int
+
+
+def _read_header(path: str) -> bytes:
+    """Read path up to and including the closing delimiter line, or to EOF."""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_CHUNK)
+        if not header.startswith(DELIMITER):
+            return header
+        search_from = 0
+        while True:
+            closing = _find_closing_delimiter(header, search_from)
+            if closing is not None:
+                return header[:closing[1]]
+            chunk = f.read(len(header))
+            if not chunk:
+                return header
+            # The delimiter may straddle the chunk boundary
+            search_from = max(0, len(header) - len(DELIMITER) - 2)
+            header += chunk
+
+
+def _find_closing_delimiter(data: bytes, search_from: int = 0) -> Optional[Tuple[int, int]]:
+    """(start, end) byte offsets of the closing '---' line, or None if not present."""
+    match = CLOSING_RE.search(data, search_from)
+    return match.span() if match else None
+
+
+def _parse_simple(text: str) -> Dict[str, Any]:
+    """Parse flat 'key: value' lines when PyYAML is not installed."""
+    data = {}
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#') or ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        data[key.strip()] = value
+    return data
+
+
+def parse_frontmatter(header: bytes) -> Frontmatter:
+    """Parse the frontmatter at the start of SKILL.md bytes.
+
+    Raises FrontmatterError with a message suitable for showing to users.
+    """
+    if not header.startswith(DELIMITER):
+        raise FrontmatterError("No YAML frontmatter found")
+    first_line_end = header.find(b'\n')
+    closing = None
+    if first_line_end != -1 and header[:first_line_end].rstrip() == DELIMITER:
+        closing = _find_closing_delimiter(header, first_line_end)
+    if closing is None:
+        raise FrontmatterError("Invalid frontmatter format")
+
+    start, end = closing
+    try:
+        text = header[first_line_end + 1:start].decode('utf-8')
+    except UnicodeDecodeError:
+        raise FrontmatterError("Frontmatter is not valid UTF-8")
+
+    if yaml is None:
+        return Frontmatter(_parse_simple(text), end)
+
+    try:
+        data = yaml.load(text, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(f"Invalid YAML in frontmatter: {e}")
+    if not isinstance(data, dict):
+        raise FrontmatterError("Frontmatter must be a YAML dictionary")
+    return Frontmatter(data, end)
+
+
+@lru_cache(maxsize=8192)
+def _read_cached(path: str, mtime_ns: int, size: int) -> Frontmatter:
+    return parse_frontmatter(_read_header(path))
+
+
+def read_frontmatter(path) -> Frontmatter:
+    """Read and parse the frontmatter of a SKILL.md file.
+
+    Results are cached until the file's mtime or size changes. The returned
+    data is a copy, so callers may modify it freely.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    data, body_offset = _read_cached(path, st.st_mtime_ns, st.st_size)
+    return Frontmatter(dict(data), body_offset)
+
+
+def clear_cache():
+    """Forget all cached parse results."""
+    _read_cached.cache_clear()
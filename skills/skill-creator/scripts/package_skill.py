@@ -2,30 +2,565 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Packages are reproducible: entries are sorted and timestamps and permissions
+are normalized, so the same skill content always produces a byte-identical
+.skill file. A content hash of the skill is stored next to the package in
+<name>.skill.json, and repackaging an unchanged skill does nothing.
+
+Files are compressed in a thread pool (zlib releases the GIL) and written to
+the archive in order. Already-compressed types (images, PDFs, archives,
+media, fonts) are stored without recompressing.
+
+Files matched by the default excludes (VCS metadata, caches, virtualenvs,
+OS and editor litter) or by a .skillignore file in the skill (gitignore
+syntax) are left out. Optional size budgets fail the build when a file or the
+package is too large.
+
+--batch packages every skill below a folder in a process pool and writes a
+skills-manifest.json listing each package's name, content hash, size and
+file count.
+
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force]
+                                  [--level 0-9] [--jobs N] [--largest N]
+                                  [--max-size SIZE] [--max-file-size SIZE]
+    python utils/package_skill.py --batch <path/to/skills> [output-directory]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+import stat
+import struct
 import sys
-import zipfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
 from quick_validate import validate_skill
+from skillignore import SKILLIGNORE_NAME, is_excluded, parse_ignore_line, read_ignore_rules
+
+# Bump when the archive layout changes so existing caches are rebuilt
+PACKAGE_FORMAT = 2
+
+# Content hash and package details, stored as <name>.skill.json
+CACHE_SUFFIX = '.json'
+
+# Written to the output directory by --batch
+DIST_MANIFEST_NAME = 'skills-manifest.json'
+
+# Directories --batch never searches for skills
+SKIP_DIRS = {'node_modules', '__pycache__'}
+
+# Never worth shipping; a .skillignore can re-include any of these with '!'
+DEFAULT_EXCLUDES = [
+    # Version control
+    '.git/', '.hg/', '.svn/', '.gitignore', '.gitattributes',
+    # Caches and build litter
+    '__pycache__/', '*.py[cod]', '.pytest_cache/', '.mypy_cache/', '.ruff_cache/', '.ipynb_checkpoints/',
+    # Virtualenvs (any directory holding a pyvenv.cfg is skipped as well)
+    '.venv/', 'venv/',
+    # OS metadata
+    '.DS_Store', '._*', 'Thumbs.db', 'desktop.ini',
+    # Editors
+    '.idea/', '.vscode/', '*.swp', '*.swo', '*~', '.#*', r'\#*#',
+    # Packaging metadata
+    SKILLIGNORE_NAME,
+]
+
+# Largest files listed before packing unless --largest is given
+DEFAULT_LARGEST = 10
+
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+# Earliest timestamp a zip entry can hold; used unless SOURCE_DATE_EPOCH is set
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# zlib level used unless --level is given (zlib's own default)
+DEFAULT_LEVEL = 6
+
+# Zip compression methods
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Formats that are already compressed; deflating them costs time and saves nothing
+STORED_SUFFIXES = frozenset("""
+.png .jpg .jpeg .gif .webp .avif .heic .ico .pdf
+.zip .gz .tgz .bz2 .xz .zst .7z .rar .jar .whl .skill
+.docx .xlsx .pptx .odt .ods .odp .epub
+.mp3 .mp4 .m4a .mov .webm .ogg .flac
+.woff .woff2
+""".split())
+
+# Zip limits past which ZIP64 extensions are written
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+ZIP64_EXTRA_ID = 0x0001
+
+# Files at least this large are read in chunks and, when stored, copied
+# straight from disk by the writer instead of being held in memory
+STREAM_THRESHOLD = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+# Source bytes compressed ahead of the writer, on top of a few files per worker
+LOOKAHEAD_BYTES = 64 * 1024 * 1024
+
+
+class PackageError(Exception):
+    """A skill cannot be packaged, e.g. because it exceeds a size budget."""
+
+
+class PackedFile(NamedTuple):
+    """A file compressed for the archive, with the stats reported per file type."""
+    arcname: str
+    method: int
+    mode: int
+    crc: int
+    size: int
+    compressed_size: int
+    # None when the file is stored and streamed from path by the writer
+    data: Optional[bytes]
+    seconds: float
+    path: Optional[Path] = None
+
+
+def format_bytes(num_bytes: int) -> str:
+    """Format a byte count for display."""
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def zip_date_time() -> Tuple[int, int, int, int, int, int]:
+    """Timestamp for every entry, from SOURCE_DATE_EPOCH if set (reproducible-builds.org)."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not epoch:
+        return ZIP_EPOCH
+    return max(time.gmtime(int(epoch))[:6], ZIP_EPOCH)
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as '500K', '2.5MB' or '1G' (binary units) into bytes."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r} (use e.g. 500K, 20MB, 1G)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+DEFAULT_RULES = [parse_ignore_line(pattern) for pattern in DEFAULT_EXCLUDES]
+
+
+def collect_files(skill_path: Path) -> Tuple[List[Tuple[str, Path]], List[str]]:
+    """Return the files to package and the skill-relative paths left out.
+
+    Files are (archive name, path) pairs sorted by archive name. Default
+    excludes apply first, then each .skillignore from the skill root down;
+    an excluded directory is not descended into, so its contents cannot be
+    re-included. Excluded directories are listed with a trailing '/'.
+    """
+    files = []
+    excluded = []
+    rules_by_dir = {str(skill_path): DEFAULT_RULES + read_ignore_rules(skill_path / SKILLIGNORE_NAME)}
+
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        rules = rules_by_dir.pop(dirpath)
+        rel_dir = Path(dirpath).relative_to(skill_path).as_posix()
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+
+        kept = []
+        for name in dirnames:
+            rel_path = prefix + name
+            full_path = os.path.join(dirpath, name)
+            if is_excluded(rel_path, True, rules) or os.path.isfile(os.path.join(full_path, 'pyvenv.cfg')):
+                excluded.append(rel_path + '/')
+                continue
+            nested = os.path.join(full_path, SKILLIGNORE_NAME)
+            rules_by_dir[full_path] = rules + read_ignore_rules(Path(nested), rel_path) if os.path.isfile(nested) else rules
+            kept.append(name)
+        dirnames[:] = kept
+
+        for name in filenames:
+            rel_path = prefix + name
+            full_path = Path(dirpath) / name
+            if not full_path.is_file():
+                continue
+            if is_excluded(rel_path, False, rules):
+                excluded.append(rel_path)
+                continue
+            # Calculate the relative path within the zip
+            files.append((f"{skill_path.name}/{rel_path}", full_path))
+
+    return sorted(files), sorted(excluded)
+
+
+def print_largest_files(files: List[Tuple[str, Path]], excluded: List[str], count: int):
+    """Pre-pack report: total to pack, the largest files and what was excluded."""
+    sizes = [(path.stat().st_size, arcname) for arcname, path in files]
+    print(f"📊 {len(files)} file(s), {format_bytes(sum(size for size, _ in sizes))} to pack")
+    if count > 0:
+        for size, arcname in heapq.nlargest(count, sizes):
+            print(f"  {format_bytes(size):>10}  {arcname}")
+    if excluded:
+        shown = ', '.join(excluded[:8]) + (', ...' if len(excluded) > 8 else '')
+        print(f"  Excluded {len(excluded)}: {shown}")
+    print()
+
+
+def check_file_budget(files: List[Tuple[str, Path]], max_file_size: int):
+    """Raise PackageError listing the files larger than max_file_size."""
+    over = sorted(((path.stat().st_size, arcname) for arcname, path in files
+                   if path.stat().st_size > max_file_size), reverse=True)
+    if over:
+        listed = ', '.join(f"{arcname} ({format_bytes(size)})" for size, arcname in over[:5])
+        raise PackageError(f"{len(over)} file(s) over the {format_bytes(max_file_size)} per-file budget: "
+                           f"{listed}{', ...' if len(over) > 5 else ''}")
+
+
+def file_mode(path: Path) -> int:
+    """Normalized permissions: executable files get 0755, everything else 0644."""
+    return 0o755 if path.stat().st_mode & 0o111 else 0o644
+
+
+def content_hash(files: List[Tuple[str, Path]]) -> str:
+    """SHA-256 over the archive names, normalized modes and contents of the files."""
+    digest = hashlib.sha256(f"skill-package-{PACKAGE_FORMAT}\n".encode())
+    for arcname, path in files:
+        digest.update(f"{arcname}\0{file_mode(path):o}\0{path.stat().st_size}\0".encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(skill_filename: Path) -> Path:
+    return skill_filename.with_name(skill_filename.name + CACHE_SUFFIX)
+
+
+def read_cache(skill_filename: Path) -> dict:
+    """The cache record stored beside a package, or {} if missing or unreadable."""
+    try:
+        with open(cache_path(skill_filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_up_to_date(skill_filename: Path, digest: str, level: int,
+                  date_time: Tuple[int, int, int, int, int, int]) -> bool:
+    """Whether the package was built from content with this hash, at this level and entry time.
+
+    The package itself must still be the one recorded, byte for byte.
+    """
+    cache = read_cache(skill_filename)
+    try:
+        size = skill_filename.stat().st_size
+    except OSError:
+        return False
+    if not (cache.get('format') == PACKAGE_FORMAT and cache.get('content_hash') == digest
+            and cache.get('compression_level') == level and cache.get('date_time') == list(date_time)
+            and cache.get('size') == size):
+        return False
+    return cache.get('sha256') == file_sha256(skill_filename)
+
+
+def file_type(arcname: str) -> str:
+    """Report bucket of a file: its lowercased suffix, or '(none)'."""
+    return Path(arcname).suffix.lower() or '(none)'
+
+
+def pack_file(arcname: str, path: Path, level: int) -> PackedFile:
+    """Read and compress one file; runs on a worker thread.
+
+    Already-compressed types, level 0 and files that deflate would make
+    larger are stored as-is. Files of STREAM_THRESHOLD bytes or more are
+    read in chunks and never held whole.
+    """
+    start = time.perf_counter()
+    deflate = level > 0 and file_type(arcname) not in STORED_SUFFIXES
+    if path.stat().st_size >= STREAM_THRESHOLD:
+        return pack_large_file(arcname, path, level, deflate, start)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    crc = zlib.crc32(raw)
+    method, data = ZIP_STORED, raw
+    if deflate:
+        # Raw deflate stream (negative window bits), as zip expects
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(raw) + compressor.flush()
+        if len(deflated) < len(raw):
+            method, data = ZIP_DEFLATED, deflated
+    return PackedFile(arcname, method, file_mode(path), crc, len(raw), len(data), data, time.perf_counter() - start)
+
 
+def pack_large_file(arcname: str, path: Path, level: int, deflate: bool, start: float) -> PackedFile:
+    """Checksum, and deflate if worthwhile, a large file one chunk at a time.
 
-def package_skill(skill_path, output_dir=None):
+    Only the deflated stream is kept; a stored file is left for the writer
+    to copy from disk.
+    """
+    crc = size = 0
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS) if deflate else None
+    chunks = []
+    compressed_size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            if compressor:
+                chunks.append(compressor.compress(chunk))
+                compressed_size += len(chunks[-1])
+                if compressed_size >= size:
+                    # Not shrinking; store it instead of keeping the stream
+                    compressor, chunks = None, []
+    if compressor:
+        chunks.append(compressor.flush())
+        data = b''.join(chunks)
+        if len(data) < size:
+            return PackedFile(arcname, ZIP_DEFLATED, file_mode(path), crc, size, len(data), data,
+                              time.perf_counter() - start)
+    return PackedFile(arcname, ZIP_STORED, file_mode(path), crc, size, size, None,
+                      time.perf_counter() - start, path)
+
+
+def pack_files(files: List[Tuple[str, Path]], level: int, jobs: int) -> Iterator[PackedFile]:
+    """Compress files in a thread pool, yielding them in input order.
+
+    At most a few files per worker, and about LOOKAHEAD_BYTES of source
+    data, are in flight ahead of the writer.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        pending_bytes = 0
+        for arcname, path in files:
+            size = path.stat().st_size
+            # Streamed files are not held in memory, so they do not count
+            weight = size if size < STREAM_THRESHOLD else 0
+            pending.append((executor.submit(pack_file, arcname, path, level), weight))
+            pending_bytes += weight
+            while len(pending) > 2 * jobs or (len(pending) > 1 and pending_bytes > LOOKAHEAD_BYTES):
+                future, weight = pending.popleft()
+                pending_bytes -= weight
+                yield future.result()
+        while pending:
+            yield pending.popleft()[0].result()
+
+
+def dos_date_time(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def write_zip(path: Path, packed: Iterator[PackedFile], date_time, verbose: bool = True) -> List[PackedFile]:
+    """Write already-compressed entries as a zip file.
+
+    zipfile can only compress on the writing thread, so entries compressed
+    by the pool are framed here directly. Sizes, offsets and entry counts
+    past the classic zip limits get ZIP64 records, as zipfile writes them.
+    Returns the entries written, without their data.
+    """
+    dos_time, dos_date = dos_date_time(date_time)
+    central = []
+    written = []
+    with open(path, 'wb') as f:
+        for entry in packed:
+            name = entry.arcname.encode('utf-8')
+            # Bit 11: the name is UTF-8
+            flags = 0x800 if not entry.arcname.isascii() else 0
+            offset = f.tell()
+            zip64_sizes = max(entry.size, entry.compressed_size) >= ZIP_MAX_SIZE
+            version = 45 if zip64_sizes or offset >= ZIP_MAX_SIZE else 20
+            # Local header: both sizes move to the ZIP64 extra field together
+            sizes = (ZIP_MAX_SIZE, ZIP_MAX_SIZE) if zip64_sizes else (entry.compressed_size, entry.size)
+            extra = struct.pack('<HHQQ', ZIP64_EXTRA_ID, 16, entry.size, entry.compressed_size) if zip64_sizes else b''
+            fields = (flags, entry.method, dos_time, dos_date, entry.crc)
+            f.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, version, *fields, *sizes, len(name), len(extra)))
+            f.write(name)
+            f.write(extra)
+            if entry.data is not None:
+                f.write(entry.data)
+            else:
+                copy_stored(entry, f)
+
+            # Central header: only the overflowing values move, in this order
+            zip64_values = [value for value in (entry.size, entry.compressed_size, offset) if value >= ZIP_MAX_SIZE]
+            extra = struct.pack(f'<HH{len(zip64_values)}Q', ZIP64_EXTRA_ID, 8 * len(zip64_values),
+                                *zip64_values) if zip64_values else b''
+            # Made by Unix (3), so the mode bits in the external attributes are honored
+            external_attr = (stat.S_IFREG | entry.mode) << 16
+            central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, *fields,
+                                       min(entry.compressed_size, ZIP_MAX_SIZE), min(entry.size, ZIP_MAX_SIZE),
+                                       len(name), len(extra), 0, 0, 0, external_attr,
+                                       min(offset, ZIP_MAX_SIZE)) + name + extra)
+            written.append(entry._replace(data=b'', path=None))
+            if verbose:
+                print(f"  Added: {entry.arcname}")
+
+        central_offset = f.tell()
+        for record in central:
+            f.write(record)
+        central_size = f.tell() - central_offset
+        count = len(central)
+        if count >= ZIP_MAX_ENTRIES or central_size >= ZIP_MAX_SIZE or central_offset >= ZIP_MAX_SIZE:
+            zip64_offset = f.tell()
+            f.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, (3 << 8) | 45, 45, 0, 0,
+                                count, count, central_size, central_offset))
+            f.write(struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1))
+        f.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, min(count, ZIP_MAX_ENTRIES), min(count, ZIP_MAX_ENTRIES),
+                            min(central_size, ZIP_MAX_SIZE), min(central_offset, ZIP_MAX_SIZE), 0))
+    return written
+
+
+def copy_stored(entry: PackedFile, f):
+    """Copy a streamed entry's file into the zip, checking it did not change since packing."""
+    crc = size = 0
+    with open(entry.path, 'rb') as src:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            f.write(chunk)
+    if (crc, size) != (entry.crc, entry.size):
+        raise OSError(f"{entry.arcname} changed while it was being packaged")
+
+
+def write_package(skill_filename: Path, files: List[Tuple[str, Path]], level: int = DEFAULT_LEVEL,
+                  jobs: int = 1, verbose: bool = True, max_size: Optional[int] = None,
+                  date_time: Optional[Tuple[int, int, int, int, int, int]] = None) -> List[PackedFile]:
+    """Write the .skill zip with sorted, normalized entries, replacing it atomically.
+
+    Every entry gets date_time, by default zip_date_time(). A package larger than max_size raises PackageError and is not kept.
+    Returns the written entries (without data) for the per-type report.
+    """
+    temp_filename = skill_filename.with_name(f".{skill_filename.name}.{os.getpid()}.tmp")
+    try:
+        written = write_zip(temp_filename, pack_files(files, level, jobs), date_time or zip_date_time(), verbose)
+        size = temp_filename.stat().st_size
+        if max_size is not None and size > max_size:
+            raise PackageError(f"Package is {format_bytes(size)}, over the {format_bytes(max_size)} budget")
+        os.replace(temp_filename, skill_filename)
+    finally:
+        if temp_filename.exists():
+            temp_filename.unlink()
+    return written
+
+
+def print_type_report(entries: List[PackedFile], elapsed: float):
+    """Print files, sizes, compression ratio and compression time per file type."""
+    totals: Dict[str, List] = {}
+    for entry in entries:
+        row = totals.setdefault(file_type(entry.arcname), [0, 0, 0, 0.0, set()])
+        row[0] += 1
+        row[1] += entry.size
+        row[2] += entry.compressed_size
+        row[3] += entry.seconds
+        row[4].add('deflate' if entry.method == ZIP_DEFLATED else 'store')
+
+    print(f"\n  {'Type':<10} {'Files':>5} {'Size':>10} {'Packed':>10} {'Ratio':>6}  {'Time':>8}  Method")
+    for suffix, (count, size, packed, seconds, methods) in sorted(totals.items(), key=lambda t: -t[1][1]):
+        ratio = packed / size if size else 1.0
+        print(f"  {suffix:<10} {count:>5} {format_bytes(size):>10} {format_bytes(packed):>10} {ratio:>6.1%}  "
+              f"{seconds * 1000:>6.1f}ms  {'/'.join(sorted(methods))}")
+    size = sum(entry.size for entry in entries)
+    print(f"  Packed {format_bytes(size)} in {elapsed * 1000:.1f}ms "
+          f"({size / elapsed / (1024 * 1024) if elapsed else 0:.1f} MB/s)")
+
+
+def write_cache(skill_filename: Path, skill_name: str, digest: str, files: List[Tuple[str, Path]],
+                level: int, date_time: Tuple[int, int, int, int, int, int]) -> dict:
+    """Record the content hash and details of a freshly written package; returns the record."""
+    record = {
+        'format': PACKAGE_FORMAT,
+        'name': skill_name,
+        'content_hash': digest,
+        'compression_level': level,
+        'date_time': list(date_time),
+        'files': len(files),
+        'input_size': sum(path.stat().st_size for _, path in files),
+        'size': skill_filename.stat().st_size,
+        'sha256': file_sha256(skill_filename),
+    }
+    final_path = cache_path(skill_filename)
+    temp_path = final_path.with_name(f".{final_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(temp_path, final_path)
+    return record
+
+
+def build_package(skill_path: Path, output_path: Path, force: bool = False, level: int = DEFAULT_LEVEL,
+                  jobs: int = 1, verbose: bool = False, largest: int = DEFAULT_LARGEST,
+                  max_size: Optional[int] = None,
+                  max_file_size: Optional[int] = None) -> Tuple[dict, Optional[List[PackedFile]]]:
+    """Package an already validated skill folder as output_path/<name>.skill.
+
+    Raises PackageError when a size budget is exceeded. Returns (cache
+    record, written entries); the entries are None when the existing
+    package was up to date and left alone.
+    """
+    skill_filename = output_path / f"{skill_path.name}.skill"
+    files, excluded = collect_files(skill_path)
+    if verbose:
+        print_largest_files(files, excluded, largest)
+    if max_file_size is not None:
+        check_file_budget(files, max_file_size)
+
+    digest = content_hash(files)
+    date_time = zip_date_time()
+    if not force and is_up_to_date(skill_filename, digest, level, date_time):
+        record = read_cache(skill_filename)
+        if max_size is not None and record['size'] > max_size:
+            raise PackageError(f"Package is {format_bytes(record['size'])}, "
+                               f"over the {format_bytes(max_size)} budget")
+        return record, None
+
+    written = write_package(skill_filename, files, level, jobs, verbose, max_size, date_time)
+    return write_cache(skill_filename, skill_path.name, digest, files, level, date_time), written
+
+
+def package_skill(skill_path, output_dir=None, force=False, level=DEFAULT_LEVEL, jobs=None,
+                  largest=DEFAULT_LARGEST, max_size=None, max_file_size=None) -> Optional[Path]:
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Rebuild the package even if its content hash is unchanged
+        level: zlib compression level, 0 (store everything) to 9
+        jobs: Compression threads (defaults to the CPU count)
+        largest: Number of largest files listed before packing
+        max_size: Optional budget in bytes for the .skill file
+        max_file_size: Optional budget in bytes for any single packaged file
 
     Returns:
-        Path to the created .skill file, or None if error
+        Path to the created (or already up-to-date) .skill file, or None if error
     """
     skill_path = Path(skill_path).resolve()
 
@@ -54,51 +589,218 @@ def package_skill(skill_path, output_dir=None):
     print(f"✅ {message}\n")
 
     # Determine output location
-    skill_name = skill_path.name
     if output_dir:
         output_path = Path(output_dir).resolve()
         output_path.mkdir(parents=True, exist_ok=True)
     else:
         output_path = Path.cwd()
 
-    skill_filename = output_path / f"{skill_name}.skill"
+    skill_filename = output_path / f"{skill_path.name}.skill"
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        start_time = time.perf_counter()
+        record, written = build_package(skill_path, output_path, force, level, jobs or os.cpu_count() or 1,
+                                        verbose=True, largest=largest, max_size=max_size,
+                                        max_file_size=max_file_size)
+        digest = record['content_hash']
+        if written is None:
+            print(f"✅ Up to date: {skill_filename} (content {digest[:12]})")
+            return skill_filename
+
+        print_type_report(written, time.perf_counter() - start_time)
+        print(f"\n✅ Successfully packaged skill to: {skill_filename} (content {digest[:12]})")
         return skill_filename
 
+    except PackageError as e:
+        print(f"❌ Size budget exceeded: {e}")
+        return None
     except Exception as e:
         print(f"❌ Error creating .skill file: {e}")
         return None
 
 
+def find_skills(root: Path) -> List[Path]:
+    """Every directory below root containing SKILL.md, without descending into skills."""
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if 'SKILL.md' in filenames:
+            skills.append(Path(dirpath))
+            dirnames[:] = []
+            continue
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS]
+    return sorted(skills)
+
+
+def package_one(skill_path: Path, output_path: Path, force: bool, level: int,
+                max_size: Optional[int], max_file_size: Optional[int]) -> dict:
+    """Validate and package one skill in a batch worker process; never raises.
+
+    Returns the package's cache record with 'path', 'up_to_date' and
+    'seconds' added, or {'path', 'error'} on failure.
+    """
+    start_time = time.perf_counter()
+    try:
+        valid, message = validate_skill(skill_path)
+        if not valid:
+            return {'path': str(skill_path), 'error': f"Validation failed: {message}"}
+        # Skills are packaged in parallel across processes, so each one compresses on one thread
+        record, written = build_package(skill_path, output_path, force, level, jobs=1,
+                                        max_size=max_size, max_file_size=max_file_size)
+    except Exception as e:
+        return {'path': str(skill_path), 'error': str(e)}
+    return {**record, 'path': str(skill_path), 'up_to_date': written is None,
+            'seconds': time.perf_counter() - start_time}
+
+
+def write_dist_manifest(output_path: Path, packages: List[dict], failures: List[dict]):
+    """Atomically write the dist manifest listing every package built by a batch run."""
+    manifest = {
+        'format': PACKAGE_FORMAT,
+        'skills': [
+            {
+                'name': package['name'],
+                'file': f"{package['name']}.skill",
+                'content_hash': package['content_hash'],
+                'size': package['size'],
+                'files': package['files'],
+            }
+            for package in sorted(packages, key=lambda p: p['name'])
+        ],
+        'failed': [{'path': failure['path'], 'error': failure['error']} for failure in failures],
+    }
+    final_path = output_path / DIST_MANIFEST_NAME
+    temp_path = final_path.with_name(f".{DIST_MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(temp_path, final_path)
+
+
+def package_batch(root, output_dir=None, force=False, level=DEFAULT_LEVEL, jobs=None,
+                  max_size=None, max_file_size=None) -> bool:
+    """
+    Package every skill below root into output_dir using a process pool.
+
+    Failures are reported without stopping the other skills, and a manifest
+    of the packages is written to output_dir/skills-manifest.json.
+
+    Args:
+        root: Directory to search for skill folders
+        output_dir: Directory for the .skill files (defaults to ./dist)
+        force: Rebuild packages even if their content hash is unchanged
+        level: zlib compression level, 0 (store everything) to 9
+        jobs: Worker processes (defaults to the CPU count)
+        max_size: Optional budget in bytes for each .skill file
+        max_file_size: Optional budget in bytes for any single packaged file
+
+    Returns:
+        True if every skill was packaged
+    """
+    root = Path(root).resolve()
+    if not root.is_dir():
+        print(f"❌ Error: Directory not found: {root}")
+        return False
+
+    output_path = Path(output_dir).resolve() if output_dir else Path.cwd() / 'dist'
+    output_path.mkdir(parents=True, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+
+    skill_paths = []
+    failures = []
+    seen = {}
+    for skill_path in find_skills(root):
+        # Packages are named after the skill folder, so equal names would overwrite each other
+        if skill_path.name in seen:
+            failures.append({'path': str(skill_path), 'error': f"Same name as {seen[skill_path.name]}"})
+            print(f"❌ {skill_path}: same name as {seen[skill_path.name]}")
+            continue
+        seen[skill_path.name] = skill_path
+        skill_paths.append(skill_path)
+
+    if not skill_paths:
+        print(f"❌ Error: No skill folders (containing SKILL.md) found in {root}")
+        return False
+
+    print(f"📦 Packaging {len(skill_paths)} skill(s) from {root}")
+    print(f"   Output directory: {output_path} ({jobs} process{'es' if jobs != 1 else ''})\n")
+
+    start_time = time.perf_counter()
+    packages = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        count = len(skill_paths)
+        results = executor.map(package_one, skill_paths, [output_path] * count, [force] * count,
+                               [level] * count, [max_size] * count, [max_file_size] * count)
+        for result in results:
+            if 'error' in result:
+                failures.append(result)
+                print(f"❌ {result['path']}: {result['error']}")
+                continue
+            packages.append(result)
+            status = "up to date" if result['up_to_date'] else f"{result['seconds'] * 1000:.0f}ms"
+            print(f"✅ {result['name']}.skill  {format_bytes(result['size'])}, {result['files']} files, "
+                  f"content {result['content_hash'][:12]} ({status})")
+    elapsed = time.perf_counter() - start_time
+
+    write_dist_manifest(output_path, packages, failures)
+
+    built = [package for package in packages if not package['up_to_date']]
+    input_size = sum(package.get('input_size', 0) for package in built)
+    print(f"\n{'=' * 60}")
+    print(f"  Packaged:   {len(built)}")
+    print(f"  Up to date: {len(packages) - len(built)}")
+    print(f"  Failed:     {len(failures)}")
+    print(f"  Time:       {elapsed:.2f}s ({len(skill_paths) / elapsed if elapsed else 0:.1f} skills/s, "
+          f"{input_size / elapsed / (1024 * 1024) if elapsed else 0:.1f} MB/s packed)")
+    print(f"  Manifest:   {output_path / DIST_MANIFEST_NAME}")
+    print(f"{'=' * 60}")
+    return not failures
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a distributable .skill file",
+        epilog="Example:\n"
+               "  python utils/package_skill.py skills/public/my-skill\n"
+               "  python utils/package_skill.py skills/public/my-skill ./dist\n"
+               "  python utils/package_skill.py --batch skills/public ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('skill_path', help='Path to the skill folder (with --batch, a folder of skills)')
+    parser.add_argument('output_dir', nargs='?', default=None,
+                        help='Directory for the .skill file (default: current directory; ./dist with --batch)')
+    parser.add_argument('--batch', '-b', action='store_true',
+                        help='Package every skill found below skill_path in parallel and write a dist manifest')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='Rebuild the package even if the skill is unchanged')
+    parser.add_argument('--level', '-l', type=int, choices=range(10), default=DEFAULT_LEVEL, metavar='0-9',
+                        help=f'Compression level; 0 stores every file (default: {DEFAULT_LEVEL})')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Compression threads, or worker processes with --batch (default: number of CPUs)')
+    parser.add_argument('--largest', type=int, default=DEFAULT_LARGEST, metavar='N',
+                        help=f'Largest files to list before packing; 0 lists none (default: {DEFAULT_LARGEST})')
+    parser.add_argument('--max-size', type=parse_size, default=None, metavar='SIZE',
+                        help='Fail if the .skill file would be larger than SIZE (e.g. 5MB)')
+    parser.add_argument('--max-file-size', type=parse_size, default=None, metavar='SIZE',
+                        help='Fail if any packaged file is larger than SIZE (e.g. 500K)')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        print("❌ Error: --jobs must be at least 1")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.batch:
+        result = package_batch(args.skill_path, args.output_dir, args.force, args.level, args.jobs,
+                               args.max_size, args.max_file_size)
+        sys.exit(0 if result else 1)
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    print(f"📦 Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, args.force, args.level, args.jobs,
+                           args.largest, args.max_size, args.max_file_size)
 
     if result:
         sys.exit(0)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared .skillignore matcher.
+
+A .skillignore file uses .gitignore syntax: '*' and '?' stay within one
+path component, '**' spans directories, a trailing '/' matches directories
+only, a leading or inner '/' anchors a pattern to the file's directory, and
+'!' re-includes a path. Rules apply in order and the last match decides.
+package_skill.py uses it for files left out of a package, and
+import_skills.py for directories skipped while discovering skills.
+"""
+
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Pattern
+
+# Per-directory file of gitignore-style patterns
+SKILLIGNORE_NAME = '.skillignore'
+
+
+class IgnoreRule(NamedTuple):
+    """One .skillignore pattern, matched against paths relative to base."""
+    base: str
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring or trailing slash) into a regex.
+
+    '*' and '?' never match '/', '**/' matches any number of directories and
+    a trailing '/**' everything inside a directory.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/') and (i + 2 == n or pattern[i + 2] == '/'):
+            if i + 2 == n:
+                out.append('.*')
+                i += 2
+            else:
+                out.append('(?:.*/)?')
+                i += 3
+            continue
+        if c == '*':
+            while i + 1 < n and pattern[i + 1] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[' and ']' in pattern[i + 2:]:
+            # Searching from i + 2 keeps a ']' right after '[' inside the set
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def parse_ignore_line(line: str, base: str = '') -> Optional[IgnoreRule]:
+    """Turn one line of a .skillignore (gitignore syntax) into a rule, or None for blanks and comments."""
+    line = line.rstrip('\n')
+    if not line.endswith('\\ '):
+        line = line.rstrip()
+    if not line or line.startswith('#'):
+        return None
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the .skillignore's directory
+    anchored = '/' in line
+    regex = glob_to_regex(line.lstrip('/'))
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return IgnoreRule(base, re.compile(regex, re.DOTALL), negate, dir_only)
+
+
+def read_ignore_rules(path: Path, base: str = '') -> List[IgnoreRule]:
+    """Rules from a .skillignore file whose patterns are relative to base (skill-relative)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    return [rule for rule in (parse_ignore_line(line, base) for line in lines) if rule]
+
+
+def is_excluded(rel_path: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """Apply rules in order like gitignore: the last matching pattern decides."""
+    excluded = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not rel_path.startswith(rule.base + '/'):
+                continue
+            path = rel_path[len(rule.base) + 1:]
+        else:
+            path = rel_path
+        if rule.regex.fullmatch(path):
+            excluded = not rule.negate
+    return excluded
@@ -7,13 +7,26 @@ Used by the claude-content-reviewer agent to provide detailed assessments.
 """
 
 import os
-import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
+# Shared SKILL.md frontmatter parser from skill-creator: a sibling skill when
+# installed, or under skills/ in the source repository
+SCRIPT_DIR = Path(__file__).resolve().parent
+for _parser_dir in (SCRIPT_DIR.parents[1] / 'skill-creator' / 'scripts',
+                    SCRIPT_DIR.parents[2] / 'skills' / 'skill-creator' / 'scripts'):
+    if (_parser_dir / 'frontmatter.py').exists():
+        sys.path.insert(0, str(_parser_dir))
+        break
+else:
+    # Never fall back to an unrelated installed 'frontmatter' package
+    print("Error: skill-creator/scripts/frontmatter.py not found next to this skill or in the repository")
+    sys.exit(1)
+from frontmatter import FrontmatterError, read_frontmatter
+
 
 @dataclass
 class Finding:
@@ -60,29 +73,27 @@ class SkillMarkdownAnalyzer:
     def read(self) -> bool:
         """Read and parse the SKILL.md file."""
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                self.content = f.read()
-            self._parse_frontmatter()
-            self.body = self._extract_body()
+            with open(self.filepath, 'rb') as f:
+                raw = f.read()
+            self.content = raw.decode('utf-8')
+            self._parse_frontmatter(raw)
             return True
         except Exception as e:
             print(f"Error reading {self.filepath}: {e}")
             return False
 
-    def _parse_frontmatter(self):
-        """Extract YAML frontmatter from the file."""
-        match = re.match(r'^---\n(.*?)\n---\n(.*)', self.content, re.DOTALL)
-        if match:
-            frontmatter_text = match.group(1)
-            for line in frontmatter_text.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    self.frontmatter[key.strip()] = value.strip()
-
-    def _extract_body(self) -> str:
-        """Extract the body content after frontmatter."""
-        match = re.match(r'^---\n.*?\n---\n(.*)', self.content, re.DOTALL)
-        return match.group(1) if match else ""
+    def _parse_frontmatter(self, raw: bytes):
+        """Extract YAML frontmatter and the body that follows it."""
+        try:
+            data, body_offset = read_frontmatter(self.filepath)
+        except FrontmatterError:
+            return
+        # The checks below treat every field as text
+        self.frontmatter = {
+            key: '' if value is None else value if isinstance(value, str) else str(value)
+            for key, value in data.items()
+        }
+        self.body = raw[body_offset:].decode('utf-8')
 
     def analyze(self) -> ContentReview:
         """Perform comprehensive analysis of the SKILL.md."""
@@ -0,0 +1,72 @@
+"""Command-line tests for import_skills.py."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_SKILLS = REPO_ROOT / 'import_skills.py'
+
+
+def run(*args, home: Path, cwd: Path) -> subprocess.CompletedProcess:
+    # HOME points at a scratch directory so the global ~/.claude/skills is never touched
+    env = dict(os.environ, HOME=str(home))
+    return subprocess.run([sys.executable, str(IMPORT_SKILLS), *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+
+def make_skill(parent: Path, name: str) -> Path:
+    skill_dir = parent / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / 'SKILL.md').write_text(f"---\nname: {name}\ndescription: The {name} skill.\n---\n# {name}\n")
+    return skill_dir
+
+
+def test_target_before_query_is_used(tmp_path):
+    target = tmp_path / 'target'
+    make_skill(target, 'demo')
+    make_skill(tmp_path / 'home' / '.claude' / 'skills', 'global-only')
+
+    result = run('--target', str(target), 'query', '--json', home=tmp_path / 'home', cwd=tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert [entry['dir'] for entry in json.loads(result.stdout)] == ['demo']
+
+
+def test_local_before_remove_uses_project_directory(tmp_path):
+    local = tmp_path / '.claude' / 'skills'
+    make_skill(local, 'demo')
+    global_skill = make_skill(tmp_path / 'home' / '.claude' / 'skills', 'demo')
+
+    result = run('--local', 'remove', 'demo', home=tmp_path / 'home', cwd=tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert not (local / 'demo').exists()
+    assert global_skill.exists()
+
+
+def test_non_utf8_frontmatter_does_not_abort_import(tmp_path):
+    source = tmp_path / 'source'
+    (source / 'demo').mkdir(parents=True)
+    (source / 'demo' / 'SKILL.md').write_bytes(b"---\nname: demo\ndescription: caf\xe9\n---\n")
+    target = tmp_path / 'target'
+
+    result = run('--source', str(source), '--target', str(target), home=tmp_path / 'home', cwd=tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert (target / 'demo' / 'SKILL.md').is_file()
+
+
+def test_local_sync_from_project_root_uses_source_not_installed_copy(tmp_path):
+    make_skill(tmp_path / 'skills', 'demo')
+    home = tmp_path / 'home'
+    assert run('--source', '.', '--local', '--sync', home=home, cwd=tmp_path).returncode == 0
+
+    (tmp_path / 'skills' / 'demo' / 'SKILL.md').write_text("---\nname: demo\ndescription: Edited.\n---\n")
+    result = run('--source', '.', '--local', '--sync', home=home, cwd=tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert 'Ignoring' not in result.stdout
+    assert 'Edited.' in (tmp_path / '.claude' / 'skills' / 'demo' / 'SKILL.md').read_text()